@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 import os
 
+from .exif_writer import _default_workers
 from .processor import process_directory
 from .processor_batch import process_directory_batch
 from .statistics import ProcessingStats
@@ -42,6 +43,11 @@ def main(argv: list[str] | None = None) -> None:
         "--batch", action="store_true",
         help="Traiter les fichiers par lots",
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Nombre de fichiers (ou, avec --batch, de lots) traités en parallèle par exiftool "
+             "(par défaut : 1 ; 0 = automatique, au plus 4)",
+    )
     parser.add_argument(
         "--geocode", action="store_true",
         help="Activer l'appel à l'API de géocodage inverse (Google Maps)",
@@ -81,6 +87,9 @@ def main(argv: list[str] | None = None) -> None:
         logging.error("exiftool introuvable. Veuillez l'installer pour utiliser ce script.")
         sys.exit(1)
 
+    # Écriture limitée par les disques plus que par le CPU : au-delà de 4 exiftool, peu de gain
+    workers = args.workers if args.workers > 0 else _default_workers()
+
     if args.batch:
         process_directory_batch(
             args.path,
@@ -88,6 +97,7 @@ def main(argv: list[str] | None = None) -> None:
             immediate_delete=immediate_delete,
             organize_files=args.organize_files,
             geocode=args.geocode,
+            workers=workers,
         )
     else:
         process_directory(
@@ -96,6 +106,7 @@ def main(argv: list[str] | None = None) -> None:
             immediate_delete=immediate_delete,
             organize_files=args.organize_files,
             geocode=args.geocode,
+            workers=workers,
         )
 
 
@@ -37,6 +37,45 @@ class MappingConfig:
     processing: dict = None
     conditional_tags: dict = None
 
+@dataclass(frozen=True, slots=True)
+class MappingPlan:
+    """Mapping précompilé pour la boucle d'écriture (voir ``ConfigLoader.compile_plan``).
+    
+    La stratégie reste lue dans ``config`` : elle peut être modifiée après chargement.
+    ``value_settings`` réunit ce qui détermine la préparation de la valeur :
+    ``(format, processing.prefix, processing.normalize, normalize)``.
+    """
+    name: str
+    source_fields: tuple
+    target_tags_image: tuple
+    target_tags_video: tuple
+    config: dict
+    value_settings: tuple = (None, '', None, None)
+    transform: Optional[str] = None
+    value_mapping: Optional[dict] = None
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StrategyPlan:
+    """Stratégie précompilée (voir ``ConfigLoader.compile_strategy``)."""
+    name: str
+    config: dict
+    group: str
+    exiftool_args: tuple
+    condition_template: Optional[str]
+    pattern: tuple
+    special_logic: bool
+
+def strategy_group(name: str, config: dict) -> str:
+    """Classe une stratégie d'après sa configuration, sans inspecter les arguments produits."""
+    if name == 'preserve_positive_rating' or config.get('special_logic'):
+        # Logique spéciale exécutée séparément pour éviter les conflits
+        return 'special_logic'
+    if '-if' in (config.get('condition_template') or '') or '-if' in config.get('exiftool_args', ()):
+        return 'conditional'
+    if config.get('pattern'):
+        return 'patterns'
+    return 'unconditional'
+
 class ConfigLoader:
     """Chargeur de configuration flexible"""
     
@@ -49,6 +88,10 @@ class ConfigLoader:
         self.config = {}
         self.strategies = {}
         self.mappings = {}
+        self._plan = None
+        self._plan_source = None
+        self._strategy_plans = {}
+        self._strategy_source = None
         
     def load_config(self, json_file: str = "exif_mapping.json", env_file: str = ".env") -> Dict[str, Any]:
         """Charge la configuration depuis JSON et .env"""
@@ -75,9 +118,71 @@ class ConfigLoader:
         # 4. Parser les stratégies et mappings
         self._parse_strategies()
         self._parse_mappings()
+        self._plan = None
+        self._strategy_plans = {}
         
         return self.config
     
+    def compile_plan(self) -> tuple:
+        """Précompile les mappings en ``MappingPlan`` (une fois par configuration chargée).
+        
+        Le plan est reconstruit par ``load_config`` et ``set_mapping``, ou si ``exif_mapping``
+        est remplacé. Un mapping modifié sur place (hors ``default_strategy``, lue à chaque
+        fichier) doit passer par ``set_mapping``.
+        """
+        mappings = self.config.get('exif_mapping', {})
+        plan = self._plan
+        if plan is None or mappings is not self._plan_source:
+            self._plan_source = mappings
+            plan = self._plan = tuple(
+                MappingPlan(
+                    name=name,
+                    source_fields=tuple(config.get('source_fields', [])),
+                    target_tags_image=tuple(config.get('target_tags_image', [])),
+                    target_tags_video=tuple(config.get('target_tags_video', [])),
+                    config=config,
+                    value_settings=(config.get('format'),
+                                    (config.get('processing') or {}).get('prefix', ''),
+                                    (config.get('processing') or {}).get('normalize'),
+                                    config.get('normalize')),
+                    transform=config.get('transform'),
+                    value_mapping=config.get('value_mapping'),
+                )
+                for name, config in mappings.items()
+            )
+        return plan
+    
+    def set_mapping(self, name: str, config: Dict[str, Any]) -> None:
+        """Ajoute ou remplace un mapping ; le plan compilé est reconstruit au prochain appel."""
+        self.config.setdefault('exif_mapping', {})[name] = config
+        self._parse_mappings()
+        self._plan = None
+    
+    def compile_strategy(self, name: str) -> StrategyPlan:
+        """Précompile une stratégie (une fois par nom et par configuration chargée).
+        
+        Une stratégie inconnue donne un plan vide (arguments simples ``-TAG=valeur``).
+        """
+        strategies = self.config.get('strategies', {})
+        if strategies is not self._strategy_source:
+            # Configuration remplacée : les plans existants ne correspondent plus
+            self._strategy_plans = {}
+            self._strategy_source = strategies
+        plan = self._strategy_plans.get(name)
+        if plan is None:
+            config = strategies.get(name, {})
+            plan = self._strategy_plans[name] = StrategyPlan(
+                name=name,
+                config=config,
+                group=strategy_group(name, config),
+                exiftool_args=tuple(config.get('exiftool_args', ())),
+                condition_template=config.get('condition_template'),
+                pattern=tuple(config.get('pattern') or ()),
+                special_logic=(name == 'preserve_positive_rating'
+                               or config.get('special_logic') == 'favorited_rating'),
+            )
+        return plan
+    
     def _load_env_overrides(self, env_path: Path):
         """Charge les overrides depuis un fichier .env"""
         with open(env_path, 'r', encoding='utf-8') as f:
@@ -159,22 +264,26 @@ class ConfigLoader:
         user_overrides = self.config.get('user_overrides', {})
         
         for name, config in mappings_config.items():
+            # Méthode liée une seule fois par mapping (évite ~10 résolutions d'attribut)
+            get = config.get
+
             # Appliquer les overrides utilisateur
-            strategy = config.get('default_strategy', 'preserve_existing')
-            if name in user_overrides and 'strategy' in user_overrides[name]:
-                strategy = user_overrides[name]['strategy']
-                
+            strategy = get('default_strategy', 'preserve_existing')
+            override = user_overrides.get(name)
+            if override and 'strategy' in override:
+                strategy = override['strategy']
+
             self.mappings[name] = MappingConfig(
                 name=name,
-                source_fields=config.get('source_fields', []),
-                target_tags_image=config.get('target_tags_image', []),
+                source_fields=get('source_fields', []),
+                target_tags_image=get('target_tags_image', []),
                 default_strategy=strategy,
-                video_tags=config.get('video_tags', []),
-                normalize=config.get('normalize'),
-                sanitize=config.get('sanitize', False),
-                value_mapping=config.get('value_mapping'),
-                processing=config.get('processing'),
-                conditional_tags=config.get('conditional_tags')
+                video_tags=get('video_tags', []),
+                normalize=get('normalize'),
+                sanitize=get('sanitize', False),
+                value_mapping=get('value_mapping'),
+                processing=get('processing'),
+                conditional_tags=get('conditional_tags')
             )
     
     def _get_default_config(self) -> Dict[str, Any]:
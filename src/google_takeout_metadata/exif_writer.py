@@ -1,110 +1,457 @@
 # Fichier : src/google_takeout_metadata/exif_writer.py
 
+import atexit
+import functools
+import itertools
+import os
+import queue
+import re
 import subprocess
 import logging
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, TYPE_CHECKING
+from typing import Any, Callable, Iterable, Iterator, List, TYPE_CHECKING
 
 from .sidecar import SidecarData
 from .timezone_calculator import create_timezone_calculator, TimezoneExifArgsGenerator
 
 if TYPE_CHECKING:
-    from .config_loader import ConfigLoader
+    from .config_loader import ConfigLoader, StrategyPlan
 
 logger = logging.getLogger(__name__)
 
-VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".3gp"}
+VIDEO_EXTS = frozenset({".mp4", ".mov", ".m4v", ".3gp"})
+# Forme tuple pour str.endswith (évite le parsing de Path.suffix)
+_VIDEO_SUFFIXES = tuple(sorted(VIDEO_EXTS))
 
-# === CONSTANTES ET NORMALISATION ===
 
-def _get_target_tags(mapping_config: dict, is_video: bool) -> list[str]:
-    """Récupère les tags cibles selon le type de média.
-    
-    Args:
-        mapping_config: Configuration du mapping
-        is_video: True si le fichier est une vidéo
-        
-    Returns:
-        Liste des tags cibles appropriés
-    """
-    if is_video:
-        return mapping_config.get('target_tags_video', [])
-    else:
-        return mapping_config.get('target_tags_image', [])
+# === CONSTANTES ET NORMALISATION ===
 
-_SMALL_WORDS = {
+_SMALL_WORDS = frozenset({
     "de", "du", "des", "la", "le", "les", "van", "von", "da", "di", "of", "and",
-    "der", "den", "het", "el", "al", "bin", "ibn", "af", "zu", "ben", "ap", "abu", "binti", "bint", "della", "delle", "dalla", "delle", "del", "dos", "das", "do", "mac", "fitz"
-}
+    "der", "den", "het", "el", "al", "bin", "ibn", "af", "zu", "ben", "ap", "abu", "binti", "bint", "della", "delle", "dalla", "del", "dos", "das", "do", "mac", "fitz"
+})
+
+# Préfixes de noms à majuscule interne (O'Brien, McDonald), indexés par leurs 2 premiers caractères
+_NAME_PREFIXES = {"o'": "O'", "mc": "Mc"}
+
+# Formats où toutes les métadonnées précèdent les données d'image : ``-fast2`` n'y cache
+# aucun tag lu par ``-if`` (PNG et vidéos peuvent placer XMP/eXIf après IDAT ou mdat)
+_FAST2_SUFFIXES = (".jpg", ".jpeg", ".tif", ".tiff", ".heic", ".heif")
 
 def _is_video_file(path: Path) -> bool:
-    return path.suffix.lower() in VIDEO_EXTS
+    return path.name.lower().endswith(_VIDEO_SUFFIXES)
+
+def _allows_fast2(path: Path) -> bool:
+    return path.name.lower().endswith(_FAST2_SUFFIXES)
+
+def _populated_source_fields(meta: SidecarData) -> set[str]:
+    """Champs source dont l'extracteur (``_FIELD_EXTRACTORS``) produit une valeur.
+    
+    Les autres mappings ne produiraient aucune valeur. ``False`` reste une valeur :
+    ``value_mapping`` décide de son sort (``"false": null`` l'ignore).
+    """
+    return {field for field, extract in _FIELD_EXTRACTORS.items() if extract(meta) is not None}
 
+def _capitalize(word: str) -> str:
+    """Majuscule initiale (et non titre, ex. "ß" → "SS") puis minuscules.
+    
+    Hors ASCII, ``str.capitalize`` utiliserait la casse de titre pour la première lettre.
+    """
+    return word[:1].upper() + word[1:].lower()
+
+@functools.lru_cache(maxsize=8192)
 def normalize_person_name(name: str) -> str:
     """Normaliser les noms de personnes (casse intelligente)"""
     if not name:
         return ""
-    parts = [p.strip() for p in name.strip().split() if p.strip()]
+    # split() sans argument ignore déjà les blancs de bord et les doublons d'espaces
+    # En ASCII, str.capitalize (C) équivaut à p[:1].upper() + p[1:].lower()
+    capitalize = str.capitalize if name.isascii() else _capitalize
     fixed: List[str] = []
-    for i, p in enumerate(parts):
+    for i, p in enumerate(name.split()):
         low = p.lower()
         if i > 0 and low in _SMALL_WORDS:
             fixed.append(low)
-        elif low.startswith("o'") and len(p) > 2:
-            fixed.append("O'" + p[2:].capitalize())
-        elif low.startswith("mc") and len(p) > 2:
-            fixed.append("Mc" + p[2:].capitalize())
+            continue
+        prefix = _NAME_PREFIXES.get(low[:2]) if len(p) > 2 else None
+        if prefix is not None:
+            fixed.append(prefix + p[2:].capitalize())
         else:
-            fixed.append(p[:1].upper() + p[1:].lower())
+            fixed.append(capitalize(p))
     return " ".join(fixed)
 
+@functools.lru_cache(maxsize=8192)
 def normalize_keyword(keyword: str) -> str:
     """Normaliser un mot-clé: trim + capitaliser chaque mot."""
     if not keyword:
         return ""
-    parts = [p.strip() for p in keyword.strip().split() if p.strip()]
     # Capitaliser chaque partie (similaire à normalize_person_name mais plus simple)
-    return " ".join(p[:1].upper() + p[1:].lower() for p in parts)
+    return " ".join(map(str.capitalize if keyword.isascii() else _capitalize, keyword.split()))
+
+# Retours à la ligne → espaces, en une seule passe
+_DESC_TRANS = str.maketrans({"\r": " ", "\n": " "})
 
 def _sanitize_description(desc: str) -> str:
     """Centralise le nettoyage des descriptions pour ExifTool."""
-    return desc.replace("\r", " ").replace("\n", " ").strip()
+    if "\n" not in desc and "\r" not in desc:
+        # Cas courant (une ligne) : strip() rend la chaîne elle-même si rien n'est retiré
+        return desc.strip()
+    return desc.translate(_DESC_TRANS).strip()
 
-def _run_exiftool_command(media_path: Path, args: list[str]) -> None:
-    """Exécute une commande exiftool avec gestion d'erreurs."""
-    cmd = [
-        "exiftool", 
-        "-overwrite_original", 
-        "-charset", "utf8"
-    ]
+# Échappements C de la syntaxe #[CSTR], appliqués en une seule passe
+_CSTR_TRANS = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r"})
+
+def argfile_line(arg: str) -> str:
+    """Encode un argument pour un fichier d'arguments exiftool (``-@``), une ligne par argument.
     
-    cmd.extend(args)
-    cmd.append(str(media_path))
+    Un retour à la ligne scinderait l'argument en deux : ces valeurs utilisent la
+    syntaxe ``#[CSTR]`` d'exiftool (séquences d'échappement C).
+    """
+    if "\n" not in arg and "\r" not in arg:
+        return arg
+    return "#[CSTR]" + arg.translate(_CSTR_TRANS)
+
+def _argfile_path(path: Path) -> bytes:
+    """Comme ``argfile_line`` pour un chemin, en octets du système de fichiers.
     
-    logger.debug(f"Commande exiftool : {' '.join(cmd)}")
+    ``os.fsencode`` restitue les noms non UTF-8 (Linux) que ``str.encode`` refuserait.
+    """
+    raw = os.fsencode(path)
+    if b"\n" not in raw and b"\r" not in raw:
+        return raw
+    return b"#[CSTR]" + raw.replace(b"\\", b"\\\\").replace(b"\n", b"\\n").replace(b"\r", b"\\r")
+
+class _Watchdog:
+    """Thread unique surveillant les échéances des commandes exiftool en cours.
+
+    Remplace un ``threading.Timer`` (donc un thread) par appel : chaque commande
+    enregistre une échéance monotone, le processus est tué si elle est dépassée.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._deadlines: dict[int, tuple[float, subprocess.Popen]] = {}
+        self._expired: set[int] = set()
+        self._tokens = itertools.count()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, process: subprocess.Popen, timeout: float) -> int:
+        """Enregistre une échéance et retourne son jeton."""
+        with self._cond:
+            token = next(self._tokens)
+            self._deadlines[token] = (time.monotonic() + timeout, process)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="exiftool-watchdog", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return token
+
+    def cancel(self, token: int) -> bool:
+        """Retire l'échéance ; True si elle avait expiré (processus tué)."""
+        with self._cond:
+            self._deadlines.pop(token, None)
+            if token in self._expired:
+                self._expired.discard(token)
+                return True
+            return False
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for token, (deadline, process) in list(self._deadlines.items()):
+                    if deadline <= now:
+                        del self._deadlines[token]
+                        self._expired.add(token)
+                        process.kill()
+                next_deadline = min((deadline for deadline, _ in self._deadlines.values()), default=None)
+                self._cond.wait(None if next_deadline is None else next_deadline - now)
+
+_watchdog = _Watchdog()
+
+class ExifToolDaemon:
+    """Processus exiftool persistant (``-stay_open True -@ -``).
+
+    Le démarrage de l'interpréteur Perl domine le coût d'un appel exiftool : un seul
+    processus reçoit les commandes sur stdin, chacune terminée par ``-execute{N}``,
+    et la réponse est lue jusqu'au marqueur ``{ready{N}}`` sur stdout.
+    """
+
+    # Options appliquées à chaque commande (équivalent de l'ancienne ligne de commande).
+    # NoDups, comme en mode lot : une valeur de liste ajoutée deux fois dans une même
+    # commande n'est écrite qu'une fois (les paires -=/+= restent nécessaires pour les
+    # valeurs déjà présentes dans le fichier)
+    COMMON_ARGS = ("-overwrite_original", "-charset", "utf8", "-codedcharacterset=utf8", "-api", "NoDups=1")
+
+    def __init__(self, executable: str = "exiftool", timeout: float = 30):
+        self.executable = executable
+        self.timeout = timeout
+        self._process: subprocess.Popen | None = None
+        self._counter = 0
+        self._stderr_lines: queue.SimpleQueue | None = None
+        # Un démon partagé entre threads : un seul échange stdin/stdout à la fois
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Lance le processus exiftool (``-charset filename`` doit précéder ``-@``)."""
+        cmd = [
+            self.executable,
+            "-charset", "filename=utf8",
+            "-stay_open", "True",
+            "-@", "-",
+            "-common_args", *self.COMMON_ARGS,
+        ]
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # stderr est vidé en continu : des avertissements dépassant le tampon du pipe
+        # bloqueraient exiftool avant son {readyN}, attendu sur stdout
+        self._stderr_lines = queue.SimpleQueue()
+        threading.Thread(target=self._drain, args=(self._process.stderr, self._stderr_lines),
+                         name="exiftool-stderr", daemon=True).start()
+        logger.debug("Démarrage du démon exiftool (pid %s)", self._process.pid)
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30, encoding='utf-8')
-        if result.stdout.strip():
-            logger.debug(f"exiftool stdout: {result.stdout.strip()}")
-        if result.stderr.strip():
-            logger.warning(f"exiftool stderr: {result.stderr.strip()}")
-    except subprocess.CalledProcessError as e:
-        out = (e.stdout or "")
-        err = (e.stderr or "")
-        logger.exception("Erreur exiftool pour %s: code %s\nstdout: %s\nstderr: %s",
-                         media_path, e.returncode, out, err)
-        # Code 2: fichiers ne satisfont pas la condition (-if) → non fatal
-        if e.returncode == 2 and ("files failed condition" in out.lower() or "files failed condition" in err.lower()):
-            logger.info("Conditions exiftool échouées pour %s (préservation attendue)", media_path)
+    @staticmethod
+    def _drain(stream, lines: queue.SimpleQueue) -> None:
+        for line in iter(stream.readline, b""):
+            lines.put(line)
+        # Fin de flux (processus arrêté) : signalée au lecteur
+        lines.put(b"")
+
+    def warm_up(self) -> None:
+        """Lance le processus à l'avance : le chargement de Perl se fait pendant la préparation des commandes.
+
+        Sans effet si le démon tourne déjà ; un échec de lancement est retenté (et signalé)
+        à la première commande.
+        """
+        with self._lock:
+            if self.running:
+                return
+            try:
+                self.start()
+            except OSError as e:
+                logger.debug("Démarrage anticipé d'exiftool impossible : %s", e)
+
+    def execute(self, args: list[str], media_path: Path) -> tuple[int, str, str]:
+        """Exécute une commande et retourne ``(status, stdout, stderr)``.
+
+        En cas de succès, stdout n'est renseigné que si le niveau DEBUG est actif.
+        """
+        return self.execute_many([(args, media_path)])[0]
+
+    def execute_many(self, commands: list[tuple[list[str], Path]]) -> list[tuple[int, str, str]]:
+        """Envoie plusieurs commandes en une seule écriture et retourne leurs résultats.
+
+        Chaque commande reste une transaction exiftool distincte (``-execute{N}``), ce qui
+        préserve l'indépendance des conditions ``-if`` ; seul l'aller-retour est mutualisé.
+        Le code de sortie est récupéré via ``-echo4 =${status}=`` (exiftool >= 12.10).
+        """
+        with self._lock:
+            return self._execute_many(commands)
+
+    def _execute_many(self, commands: list[tuple[list[str], Path]]) -> list[tuple[int, str, str]]:
+        if not self.running:
+            self.start()
+        lines = []
+        markers = []
+        for args, media_path in commands:
+            self._counter += 1
+            num = self._counter
+            if args:
+                lines.append("\n".join(map(argfile_line, args)).encode("utf-8"))
+            lines.append(_argfile_path(media_path))
+            lines.append(f"-echo4\n=${{status}}=post{num}\n-execute{num}".encode())
+            markers.append((f"{{ready{num}}}".encode(), f"post{num}".encode()))
+        payload = b"\n".join(lines) + b"\n"
+
+        process = self._process
+        stderr_lines = self._stderr_lines
+        token = _watchdog.watch(process, self.timeout * len(commands))
+        results = []
+        try:
+            if len(commands) == 1:
+                process.stdin.write(payload)
+                process.stdin.flush()
+            else:
+                # Écriture concurrente : un gros payload ne doit pas bloquer la lecture des réponses
+                writer = threading.Thread(target=self._write, args=(process, payload), daemon=True)
+                writer.start()
+            for ready, post in markers:
+                stdout = self._read_until(process.stdout.readline, ready)
+                stderr = self._read_until(stderr_lines.get, post)
+                results.append(self._parse_result(stdout, stderr))
+        except (OSError, EOFError) as e:
+            process.kill()
+            self._process = None
+            if _watchdog.cancel(token):
+                raise subprocess.TimeoutExpired(self.executable, self.timeout) from e
+            raise RuntimeError(f"Le démon exiftool s'est arrêté pendant le traitement de {commands[-1][1]}") from e
+        finally:
+            _watchdog.cancel(token)
+        return results
+
+    @staticmethod
+    def _write(process: subprocess.Popen, payload: bytes) -> None:
+        try:
+            process.stdin.write(payload)
+            process.stdin.flush()
+        except OSError:
+            # Processus arrêté : l'erreur est remontée par la lecture
+            pass
+
+    @staticmethod
+    def _parse_result(stdout: list[bytes], stderr: list[bytes]) -> tuple[int, str, str]:
+        """Décode la réponse ; stdout n'est décodé qu'en cas d'échec ou en mode debug."""
+        err = b"".join(stderr[:-1]).decode("utf-8", "replace") if len(stderr) > 1 else ""
+        # Dernière ligne de stderr : "=STATUS=postN"
+        try:
+            status = int(stderr[-1].split(b"=")[1])
+        except (IndexError, ValueError):
+            # exiftool < 12.10 : ${status} non supporté, déduire le code de la sortie
+            out = b"".join(stdout).decode("utf-8", "replace")
+            status = 2 if "files failed condition" in out.lower() else (1 if "Error" in err else 0)
+            return status, out, err
+        if status == 0 and not logger.isEnabledFor(logging.DEBUG):
+            # Sortie uniquement journalisée en debug : inutile de la décoder
+            return status, "", err
+        return status, b"".join(stdout).decode("utf-8", "replace"), err
+
+    @staticmethod
+    def _read_until(readline, marker: bytes) -> list[bytes]:
+        """Lit ligne par ligne (``readline()``) jusqu'à ``marker`` (exclu de stdout)."""
+        lines = []
+        while True:
+            line = readline()
+            if not line:
+                raise EOFError("Fin inattendue de la sortie exiftool")
+            stripped = line.rstrip()
+            if stripped == marker:
+                return lines
+            if stripped.endswith(marker):
+                lines.append(stripped)
+                return lines
+            lines.append(line)
+
+    def close(self) -> None:
+        """Arrête proprement le processus (``-stay_open False``)."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None or process.poll() is not None:
             return
-        raise RuntimeError(f"Échec de la commande exiftool pour {media_path}: {err or out}") from e
+        try:
+            process.stdin.write(b"-stay_open\nFalse\n")
+            process.stdin.flush()
+            process.communicate(timeout=self.timeout)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def __enter__(self) -> "ExifToolDaemon":
+        if not self.running:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _default_workers() -> int:
+    """Nombre de démons exiftool par défaut : un par cœur, au plus 4 (``--workers 0``)."""
+    return min(os.cpu_count() or 1, 4)
+
+class ExifToolPool:
+    """Pool de démons exiftool servis par des threads.
+
+    exiftool traite une commande à la fois : plusieurs démons permettent d'écrire
+    plusieurs fichiers en parallèle. Des threads suffisent, le GIL étant relâché
+    pendant les lectures/écritures sur les pipes.
+    """
+
+    def __init__(self, size: int | None = None, executable: str = "exiftool"):
+        self.size = size or _default_workers()
+        self._daemons = [ExifToolDaemon(executable=executable) for _ in range(self.size)]
+        self._idle: queue.Queue[ExifToolDaemon] = queue.Queue()
+        for daemon in self._daemons:
+            self._idle.put(daemon)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="exiftool")
+
+    def warm_up(self) -> None:
+        """Lance tous les démons à l'avance (voir ``ExifToolDaemon.warm_up``)."""
+        for daemon in self._daemons:
+            daemon.warm_up()
+
+    def map(self, fn: Callable[[Any, ExifToolDaemon], Any], items: Iterable) -> Iterator:
+        """Appelle ``fn(item, démon)`` dans les threads du pool, chaque appel avec un démon libre."""
+        return self._executor.map(lambda item: self._with_daemon(fn, item), items)
+
+    def _with_daemon(self, fn: Callable[[Any, ExifToolDaemon], Any], item: Any) -> Any:
+        daemon = self._idle.get()
+        try:
+            return fn(item, daemon)
+        finally:
+            self._idle.put(daemon)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for daemon in self._daemons:
+            daemon.close()
+
+    def __enter__(self) -> "ExifToolPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+_daemon: ExifToolDaemon | None = None
+
+def get_daemon() -> ExifToolDaemon:
+    """Récupère le démon exiftool global (créé à la demande, arrêté à la sortie)."""
+    global _daemon
+    if _daemon is None:
+        _daemon = ExifToolDaemon()
+        atexit.register(_daemon.close)
+    return _daemon
+
+def _run_exiftool_command(media_path: Path, args: list[str], daemon: ExifToolDaemon | None = None) -> None:
+    """Exécute une commande exiftool avec gestion d'erreurs."""
+    _run_exiftool_commands(media_path, [args], daemon)
+
+def _run_exiftool_commands(media_path: Path, commands: list[list[str]], daemon: ExifToolDaemon | None = None) -> None:
+    """Exécute plusieurs commandes exiftool sur un fichier en un seul aller-retour avec le démon."""
+    if logger.isEnabledFor(logging.DEBUG):
+        for args in commands:
+            logger.debug("Commande exiftool : %s %s", " ".join(args), media_path)
+    
+    try:
+        results = (daemon or get_daemon()).execute_many([(args, media_path) for args in commands])
     except subprocess.TimeoutExpired as e:
         logger.exception("Timeout exiftool pour %s", media_path)
         raise RuntimeError(f"Timeout exiftool pour {media_path}") from e
+    
+    for status, out, err in results:
+        _check_exiftool_result(media_path, status, out, err)
+
+def _check_exiftool_result(media_path: Path, status: int, out: str, err: str) -> None:
+    """Journalise le résultat d'une commande et lève RuntimeError en cas d'échec."""
+    if status != 0:
+        # Code 2: fichiers ne satisfont pas la condition (-if) → non fatal
+        if status == 2 and ("files failed condition" in out.lower() or "files failed condition" in err.lower()):
+            logger.info("Conditions exiftool échouées pour %s (préservation attendue)", media_path)
+            return
+        logger.error("Erreur exiftool pour %s: code %s\nstdout: %s\nstderr: %s",
+                     media_path, status, out, err)
+        raise RuntimeError(f"Échec de la commande exiftool pour {media_path}: {err or out}")
+    if out.strip():
+        logger.debug("exiftool stdout: %s", out.strip())
+    if err.strip():
+        logger.warning("exiftool stderr: %s", err.strip())
 
-def write_metadata(media_path: Path, meta: SidecarData, use_localTime: bool = False, config_loader: 'ConfigLoader' = None) -> None:
+def write_metadata(media_path: Path, meta: SidecarData, use_localTime: bool = False, config_loader: 'ConfigLoader' = None,
+                   daemon: ExifToolDaemon | None = None) -> None:
     """Écrit les métadonnées en utilisant la configuration découverte automatiquement.
     
     Args:
@@ -112,6 +459,7 @@ def write_metadata(media_path: Path, meta: SidecarData, use_localTime: bool = Fa
         meta: Métadonnées à écrire
         use_localTime: Utiliser l'heure locale
         config_loader: Loader de configuration (créé automatiquement si None)
+        daemon: Démon exiftool à utiliser (démon global si None)
     """
     if config_loader is None:
         from .config_loader import ConfigLoader
@@ -119,60 +467,200 @@ def write_metadata(media_path: Path, meta: SidecarData, use_localTime: bool = Fa
         config_loader.load_config()
     
     # Séparer les arguments par type de stratégie pour éviter les conflits
-    args_by_strategy = _group_args_by_strategy(meta, media_path, use_localTime, config_loader)
+    is_video = _is_video_file(media_path)
+    args_by_strategy = _group_args_by_strategy(meta, media_path, use_localTime, config_loader, is_video)
     
-    # Exécuter chaque groupe d'arguments séparément
+    # Une transaction par groupe conditionnel, toutes en un seul aller-retour
     for strategy_type, args in args_by_strategy.items():
         if args:
-            logger.debug(f"Exécution des arguments {strategy_type}: {args}")
-            _run_exiftool_command(media_path, args)
+            logger.debug("Exécution des arguments %s: %s", strategy_type, args)
+    commands = _strategy_transactions(args_by_strategy, _allows_fast2(media_path))
+    if commands:
+        _run_exiftool_commands(media_path, commands, daemon)
+    else:
+        logger.debug("Aucune métadonnée à écrire pour %s", media_path)
 
-def _group_args_by_strategy(meta: SidecarData, media_path: Path, use_localTime: bool, config_loader: 'ConfigLoader') -> dict:
-    """Groupe les arguments par type de stratégie pour les exécuter séparément."""
-    is_video = _is_video_file(media_path)
+# Groupes de stratégie dont les arguments contiennent des conditions -if (voir config_loader.strategy_group)
+_CONDITIONAL_GROUPS = frozenset({'conditional', 'special_logic'})
+
+def _strategy_transactions(args_by_strategy: dict, fast2: bool) -> list[list[str]]:
+    """Transactions d'un fichier, dans l'ordre des groupes.
     
-    # Récupérer la configuration
-    mappings = config_loader.config.get('exif_mapping', {})
-    strategies = config_loader.config.get('strategies', {})
+    Seuls les groupes à conditions ``-if`` ont besoin d'une transaction isolée : les groupes
+    sans condition (unconditional, patterns) partagent la leur, soit une réécriture du
+    fichier en moins.
     
-    # Groupes d'arguments par type de stratégie
-    grouped_args = {
-        'conditional': [],     # Arguments avec conditions -if
-        'unconditional': [],   # Arguments sans condition (replace_all, clean_duplicates)
-        'patterns': [],        # Arguments avec patterns spéciaux
-        'special_logic': []    # Arguments avec logique spéciale (ex: preserve_positive_rating)
-    }
+    Avec ``fast2`` (voir ``_allows_fast2`` : JPEG, TIFF, HEIC), les transactions
+    conditionnelles commencent par ``-fast2`` : la condition lit les tags sans analyser les
+    MakerNotes, qui ne sont ni écrits ni testés. Ailleurs (PNG, vidéos), ``-fast2`` arrête la
+    lecture aux données d'image (IDAT, mdat) : des métadonnées placées après fausseraient
+    ``-if``. Sans ``-if``, l'option n'a quasiment pas d'effet en écriture.
+    """
+    transactions = []
+    merged = None
+    for strategy_type, args in args_by_strategy.items():
+        if not _has_tag_writes(args):
+            # Groupe vide ou réduit à des conditions -if : exiftool n'écrirait rien
+            continue
+        if strategy_type in _CONDITIONAL_GROUPS:
+            fused = _fuse_conditions(args)
+            transactions.append(["-fast2", *fused] if fast2 else list(fused))
+        elif merged is None:
+            merged = list(args)
+            transactions.append(merged)
+        else:
+            merged.extend(args)
+    return transactions
+
+def _fuse_conditions(args: list[str]) -> list[str]:
+    """Réunit les ``-if`` d'une transaction en une seule expression ``(A) and (B)``.
+    
+    exiftool exige déjà que toutes les conditions d'une commande soient vraies : le résultat
+    est identique, mais une seule expression Perl est évaluée par fichier au lieu d'une
+    par tag. Les conditions en double ne sont gardées qu'une fois.
+    """
+    conditions = {}
+    writes = []
+    it = iter(args)
+    for arg in it:
+        if arg == '-if':
+            conditions[next(it, '')] = None
+        else:
+            writes.append(arg)
+    if len(conditions) < 2:
+        return args
+    return ['-if', ' and '.join(f'({condition})' for condition in conditions), *writes]
+
+def _has_tag_writes(args: list[str]) -> bool:
+    """Vrai si ``args`` contient au moins une écriture (``-TAG=...``, ``-TAG<...``) hors conditions ``-if``."""
+    it = iter(args)
+    for arg in it:
+        if arg == '-if':
+            next(it, None)
+        elif arg[:1] == '-' and ('=' in arg or '<' in arg):
+            return True
+    return False
+
+def _iter_tag_args(meta: SidecarData, is_video: bool, use_localTime: bool, config_loader: 'ConfigLoader'):
+    """Parcourt les mappings configurés et produit ``(groupe de stratégie, arguments)`` par tag.
+    
+    Boucle commune à ``_group_args_by_strategy`` et ``build_exiftool_args``.
+    """
+    # Mappings et stratégies précompilés une fois par chargement de la configuration
+    # Seuls les mappings dont un champ source est renseigné peuvent produire une valeur
+    populated = _populated_source_fields(meta)
+    
+    # Valeurs déjà extraites : plusieurs mappings lisent les mêmes champs (albums, personnes, GPS)
+    values = {}
+    prepared = {}
     
     # Traiter chaque mapping configuré
-    for _, mapping_config in mappings.items():
-        source_fields = mapping_config.get('source_fields', [])
-        target_tags = _get_target_tags(mapping_config, is_video)
-        default_strategy = mapping_config.get('default_strategy', 'write_if_missing')
+    for plan in config_loader.compile_plan():
+        if populated.isdisjoint(plan.source_fields):
+            continue
+        target_tags = plan.target_tags_video if is_video else plan.target_tags_image
+        if not target_tags:
+            continue
         
         # Extraire la valeur depuis les métadonnées
-        value = _extract_value_from_meta(meta, source_fields)
+        source_fields = plan.source_fields
+        if source_fields in values:
+            value = values[source_fields]
+        else:
+            value = values[source_fields] = _extract_value_from_meta(meta, source_fields)
         if value is None:
             continue
+        
+        # Valeur formatée/normalisée une seule fois : people_name et people_keywords
+        # partagent la même liste de noms normalisés
+        key = (source_fields, plan.value_settings)
+        if key in prepared:
+            value = prepared[key]
+        else:
+            value = prepared[key] = _prepare_value(value, _value_key(plan.value_settings), use_localTime)
+        default_strategy = plan.config.get('default_strategy', 'write_if_missing')
             
         # Appliquer la stratégie pour chaque tag cible
-        strategy_config = strategies.get(default_strategy, {})
+        strategy = config_loader.compile_strategy(default_strategy)
+        group = strategy.group
+        
+        # 4. Transformation (ex: boolean_to_rating) : mêmes arguments pour tous les tags
+        if plan.transform == 'boolean_to_rating' and isinstance(value, bool):
+            rating_args = _FAVORITE_RATING_ARGS if value else ()
+            for tag in target_tags:
+                yield group, rating_args
+            continue
+        
+        # 5. value_mapping, indépendant du tag : une fois par mapping
+        value = _apply_value_mapping(value, plan.value_mapping)
+        if value is None:
+            # Valeur mappée à null = ignorer
+            continue
         
         for tag in target_tags:
-            tag_args = _build_tag_args(tag, value, strategy_config, mapping_config, is_video, use_localTime)
-            
-            # Classer les arguments selon leur type
-            if default_strategy == 'preserve_positive_rating' or strategy_config.get('special_logic'):
-                # Logique spéciale exécutée séparément pour éviter les conflits
-                grouped_args['special_logic'].extend(tag_args)
-            elif any('-if' in str(arg) for arg in tag_args):
-                grouped_args['conditional'].extend(tag_args)
-            elif strategy_config.get('pattern'):
-                grouped_args['patterns'].extend(tag_args)
-            else:
-                grouped_args['unconditional'].extend(tag_args)
+            tag_args = _build_tag_args(tag, value, strategy)
+            yield group, tag_args
+
+def _dedup_units(args: tuple[str, ...]):
+    """Découpe un bloc sans condition en unités de déduplication.
+    
+    Une paire ``-TAG-=v`` / ``-TAG+=v`` (clean_duplicates) reste une seule unité : elle est
+    gardée ou écartée en entier, l'ordre retrait puis ajout n'est jamais défait. Tout autre
+    argument est sa propre unité.
+    """
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        name, _, value = arg.partition('=')
+        if name[-1:] == '-' and i + 1 < len(args) and args[i + 1] == f"{name[:-1]}+={value}":
+            yield args[i:i + 2]
+            i += 2
+        else:
+            yield args[i:i + 1]
+            i += 1
+
+def _group_args_by_strategy(meta: SidecarData, media_path: Path, use_localTime: bool, config_loader: 'ConfigLoader',
+                            is_video: bool | None = None) -> dict:
+    """Groupe les arguments par type de stratégie pour les exécuter séparément.
+    
+    ``is_video`` peut être fourni par l'appelant qui l'a déjà calculé pour ``media_path``.
+    """
+    if is_video is None:
+        is_video = _is_video_file(media_path)
+    
+    # Groupes d'arguments par type de stratégie
+    grouped_args = {
+        'conditional': [],     # Arguments avec conditions -if
+        'unconditional': [],   # Arguments sans condition (replace_all, clean_duplicates)
+        'patterns': [],        # Arguments avec patterns spéciaux
+        'special_logic': []    # Arguments avec logique spéciale (ex: preserve_positive_rating)
+    }
+    
+    # Une seule déduplication, par unité : plusieurs mappings écrivent les mêmes valeurs
+    # dans les mêmes tags (personnes et albums en mots-clés, par exemple)
+    seen = set()
+    for group, tag_args in _iter_tag_args(meta, is_video, use_localTime, config_loader):
+        args = grouped_args[group]
+        if group in _CONDITIONAL_GROUPS:
+            # Bloc -if : la condition porte sur les écritures qui la suivent, unité indivisible
+            units = (tag_args,)
+        else:
+            units = _dedup_units(tag_args)
+        for unit in units:
+            key = (group, unit)
+            if key not in seen:
+                seen.add(key)
+                args.extend(unit)
     
     return grouped_args
 
+def _file_args(config: dict, is_video: bool, include_common_args: bool = True) -> list[str]:
+    """Options globales d'un fichier : ``common_args`` configurés puis API QuickTime pour les vidéos."""
+    args = list(config.get('global_settings', {}).get('common_args', [])) if include_common_args else []
+    if is_video:
+        args.extend(['-api', 'QuickTimeUTC=1'])
+    return args
+
 def build_exiftool_args(meta: SidecarData, media_path: Path, use_localTime: bool, config_loader: 'ConfigLoader') -> list[str]:
     """Construit les arguments exiftool en utilisant les mappings de configuration découverts.
     
@@ -185,103 +673,119 @@ def build_exiftool_args(meta: SidecarData, media_path: Path, use_localTime: bool
     Returns:
         Liste des arguments exiftool
     """
-    args = []
     is_video = _is_video_file(media_path)
     
-    # Récupérer la configuration
-    mappings = config_loader.config.get('exif_mapping', {})
-    strategies = config_loader.config.get('strategies', {})
-    global_settings = config_loader.config.get('global_settings', {})
+    # Arguments globaux (API QuickTime UTC comprise pour les vidéos)
+    args = _file_args(config_loader.config, is_video)
     
-    # Arguments globaux
-    common_args = global_settings.get('common_args', [])
-    args.extend(common_args)
-    
-    # Ajouter l'API QuickTime UTC pour les vidéos
-    if is_video:
-        args.extend(['-api', 'QuickTimeUTC=1'])
-    
-    # Traiter chaque mapping configuré
-    for mapping_config in mappings.values():
-        source_fields = mapping_config.get('source_fields', [])
-        target_tags = _get_target_tags(mapping_config, is_video)
-        default_strategy = mapping_config.get('default_strategy', 'write_if_missing')
-        
-        # Extraire la valeur depuis les métadonnées
-        value = _extract_value_from_meta(meta, source_fields)
-        if value is None:
-            continue
-            
-        # Appliquer la stratégie pour chaque tag cible
-        strategy_config = strategies.get(default_strategy, {})
-        for tag in target_tags:
-            tag_args = _build_tag_args(tag, value, strategy_config, mapping_config, is_video, use_localTime)
-            args.extend(tag_args)
+    for _, tag_args in _iter_tag_args(meta, is_video, use_localTime, config_loader):
+        args.extend(tag_args)
     
     # Appliquer la correction de fuseau horaire si activée
     timezone_config = config_loader.config.get('timezone_correction', {})
     if timezone_config.get('enabled', False):
-        args = enhance_args_with_timezone_correction(args, meta, media_path, timezone_config)
+        args = enhance_args_with_timezone_correction(args, meta, media_path, timezone_config, is_video)
     
     return args
 
+def build_exiftool_transactions(meta: SidecarData, media_path: Path, use_localTime: bool, config_loader: 'ConfigLoader',
+                                include_common_args: bool = True) -> list[list[str]]:
+    """Comme ``build_exiftool_args``, mais une transaction par groupe de stratégie.
+    
+    Dans une seule commande, un ``-if`` non satisfait annulerait aussi les écritures
+    inconditionnelles (dates, GPS) : chaque groupe conditionnel est destiné à sa propre
+    section ``-execute`` d'un même appel exiftool (voir ``_strategy_transactions``).
+    
+    ``include_common_args=False`` omet ``global_settings.common_args`` : l'appelant
+    les passe alors une seule fois via ``-common_args`` (mode par lots).
+    
+    Returns:
+        Liste de transactions non vides, chacune avec les options globales du fichier
+    """
+    is_video = _is_video_file(media_path)
+    
+    file_args = _file_args(config_loader.config, is_video, include_common_args)
+    
+    args_by_strategy = _group_args_by_strategy(meta, media_path, use_localTime, config_loader, is_video)
+    
+    # Les corrections de fuseau horaire portent sur les dates, écrites sans condition
+    timezone_config = config_loader.config.get('timezone_correction', {})
+    if timezone_config.get('enabled', False):
+        args_by_strategy['unconditional'] = enhance_args_with_timezone_correction(
+            args_by_strategy['unconditional'], meta, media_path, timezone_config, is_video)
+    
+    return [[*file_args, *args] for args in _strategy_transactions(args_by_strategy, _allows_fast2(media_path))]
+
 def _extract_value_from_meta(meta: SidecarData, source_fields: list) -> any:
     """Extrait une valeur depuis SidecarData basé sur les champs source configurés.
     
-    Supporte les patterns JSON originaux (ex: 'geoData.latitude') et les champs SidecarData directs (ex: 'geoData_latitude').
-    Les patterns JSON originaux sont privilégiés pour la lisibilité et la maintenance.
+    Supporte les patterns JSON originaux (ex: 'geoData.latitude'), résolus via la table
+    ``_FIELD_EXTRACTORS`` (une recherche de dictionnaire par champ).
     
-    Gère aussi les cas spéciaux comme la combinaison de latitude/longitude pour les vidéos.
+    Gère aussi les cas spéciaux comme la combinaison de latitude/longitude (``GPSPosition``).
     """
-    # Cas spécial : combinaison GPS pour vidéos
-    if len(source_fields) == 2 and "geoData.latitude" in source_fields and "geoData.longitude" in source_fields:
-        if meta.geoData_latitude is not None and meta.geoData_longitude is not None:
-            return f"{meta.geoData_latitude},{meta.geoData_longitude}"
-        return None
+    # Cas le plus courant : un seul champ, une seule recherche
+    if len(source_fields) == 1:
+        extract = _FIELD_EXTRACTORS.get(source_fields[0])
+        return None if extract is None else extract(meta)
+    
+    # Cas spéciaux : champs combinés en une valeur (ex: GPSPosition)
+    combined = _COMBINED_EXTRACTORS.get(tuple(source_fields))
+    if combined is not None:
+        return combined(meta)
     
     for field_path in source_fields:
-        # Patterns JSON originaux (privilégiés pour lisibilité)
-        if field_path == "description" and meta.description:
-            return _sanitize_description(meta.description)
-        elif field_path == "title" and meta.title:  # title -> title dans SidecarData
-            return meta.title
-        elif field_path in ["people", "people.name", "people[].name"] and meta.people_name:
-            return meta.people_name
-        elif field_path == "photoTakenTime.timestamp" and meta.photoTakenTime_timestamp is not None:
-            return meta.photoTakenTime_timestamp
-        elif field_path == "creationTime.timestamp" and meta.creationTime_timestamp is not None:
-            return meta.creationTime_timestamp
-        elif field_path == "geoData.latitude" and meta.geoData_latitude is not None:
-            return meta.geoData_latitude
-        elif field_path == "geoData.longitude" and meta.geoData_longitude is not None:
-            return meta.geoData_longitude
-        elif field_path == "geoData.altitude" and meta.geoData_altitude is not None:
-            return meta.geoData_altitude
-        elif field_path == "geoData.altitude_ref" and meta.geoData_altitude_ref is not None:
-            return meta.geoData_altitude_ref
-        # Gérer les références GPS (N/S, E/W) basées sur le signe
-        elif field_path == "geoData.latitude.ref" and hasattr(meta, 'geoData_latitude') and meta.geoData_latitude is not None:
-            return "positive" if meta.geoData_latitude >= 0 else "negative"
-        elif field_path == "geoData.longitude.ref" and hasattr(meta, 'geoData_longitude') and meta.geoData_longitude is not None:
-            return "positive" if meta.geoData_longitude >= 0 else "negative"
-        # Autres champs
-        elif field_path == "albums" and meta.albums:
-            return meta.albums
-        elif field_path == "favorited" and meta.favorited is not None:
-            return meta.favorited
-        elif field_path == "city" and meta.city:
-            return meta.city
-        elif field_path == "country" and meta.country:
-            return meta.country
-        elif field_path == "state" and meta.state:
-            return meta.state
-        elif field_path == "place_name" and meta.place_name:
-            return meta.place_name
-        elif field_path == "googlePhotosOrigin.mobileUpload.deviceFolder.localFolderName" and meta.googlePhotosOrigin_localFolderName:
-            return meta.googlePhotosOrigin_localFolderName
+        extract = _FIELD_EXTRACTORS.get(field_path)
+        if extract is not None:
+            value = extract(meta)
+            if value is not None:
+                return value
     
     return None
 
+def _sign_ref(value: float | None) -> str | None:
+    """Référence GPS (N/S, E/W) basée sur le signe."""
+    if value is None:
+        return None
+    return "positive" if value >= 0 else "negative"
+
+# Champ source (patterns JSON originaux) → extracteur ; None = champ absent ou vide
+_FIELD_EXTRACTORS = {
+    "description": lambda m: _sanitize_description(m.description) if m.description else None,
+    "title": lambda m: m.title or None,
+    "people": lambda m: m.people_name or None,
+    "people.name": lambda m: m.people_name or None,
+    "people[].name": lambda m: m.people_name or None,
+    "photoTakenTime.timestamp": lambda m: m.photoTakenTime_timestamp,
+    "creationTime.timestamp": lambda m: m.creationTime_timestamp,
+    # Nombres : la virgule fixe est appliquée à la construction de -TAG=valeur (_fixed_point)
+    "geoData.latitude": lambda m: m.geoData_latitude,
+    "geoData.longitude": lambda m: m.geoData_longitude,
+    "geoData.altitude": lambda m: m.geoData_altitude,
+    "geoData.altitude_ref": lambda m: m.geoData_altitude_ref,
+    "geoData.latitude.ref": lambda m: _sign_ref(m.geoData_latitude),
+    "geoData.longitude.ref": lambda m: _sign_ref(m.geoData_longitude),
+    "albums": lambda m: m.albums or None,
+    "favorited": lambda m: m.favorited,
+    "city": lambda m: m.city or None,
+    "country": lambda m: m.country or None,
+    "state": lambda m: m.state or None,
+    "place_name": lambda m: m.place_name or None,
+    "googlePhotosOrigin.mobileUpload.deviceFolder.localFolderName": lambda m: m.googlePhotosOrigin_localFolderName or None,
+}
+
+def _gps_position(meta: SidecarData) -> str | None:
+    """Combinaison GPS "lat, lon" signée (exiftool en déduit les références)."""
+    if meta.geoData_latitude is not None and meta.geoData_longitude is not None:
+        return f"{meta.geoData_latitude:.7f}, {meta.geoData_longitude:.7f}"
+    return None
+
+# Champs source combinés → extracteur (les deux ordres de déclaration sont acceptés)
+_COMBINED_EXTRACTORS = {
+    ("geoData.latitude", "geoData.longitude"): _gps_position,
+    ("geoData.longitude", "geoData.latitude"): _gps_position,
+}
+
 def boolean_to_rating(val: bool | None) -> int | None:
     if val is True:
         return 5
@@ -298,61 +802,90 @@ def make_rating_args(favorited: bool | None) -> list[str]:
         f'-XMP:Rating={value}'
     ]
 
+# Arguments d'un favori, identiques pour chaque fichier : construits une fois
+_FAVORITE_RATING_ARGS = tuple(make_rating_args(True))
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Format EXIF des mappings de dates (config/exif_mapping.json)
+_EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+@functools.lru_cache(maxsize=65536)
+def _format_timestamp(value: int | float, format_template: str, use_localTime: bool) -> str:
+    """Formatage mis en cache : les rafales et imports d'album partagent souvent le même timestamp.
+    
+    En UTC, l'epoch + timedelta évite l'appel gmtime() de la plateforme, qui refuse
+    les timestamps négatifs (photos antérieures à 1970) sous Windows.
+    """
+    dt = datetime.fromtimestamp(value) if use_localTime else _EPOCH_UTC + timedelta(seconds=value)
+    if format_template == _EXIF_DATETIME_FORMAT and dt.year >= 1000:
+        # Chaque timestamp est en général unique : éviter strftime sur le format usuel
+        return f"{dt.year}:{dt.month:02d}:{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    return dt.strftime(format_template)
+
 def _format_timestamp_value(value: any, format_template: str, use_localTime: bool = False) -> any:
     """Formate une valeur timestamp selon le template spécifié."""
     if not format_template or not isinstance(value, (int, float)):
         return value
     
     try:
-        dt = datetime.fromtimestamp(value) if use_localTime else datetime.fromtimestamp(value, tz=timezone.utc)
-        return dt.strftime(format_template)
-    except (ValueError, OSError):
+        return _format_timestamp(value, format_template, use_localTime)
+    except (ValueError, OSError, OverflowError):
         # En cas d'erreur, garder la valeur originale
         return value
 
-def _apply_processing_to_value(value: any, processing: dict) -> any:
-    """Applique le traitement (prefix, normalisation) à une valeur."""
-    if not processing:
-        return value
-    
-    prefix = processing.get('prefix', '')
-    processing_normalize = processing.get('normalize')
+_NORMALIZERS = {'keyword': normalize_keyword, 'person_name': normalize_person_name}
+
+@functools.lru_cache(maxsize=64)
+def _value_transform(prefix: str, processing_normalize: str | None, normalize_type: str | None):
+    """Compose traitement (prefix, normalisation) et normalisation directe en une seule fonction.
     
-    if not prefix and not processing_normalize:
-        return value
+    Retourne None si le mapping n'a aucune transformation (cas des dates, GPS, titre).
+    """
+    steps = []
+    if prefix:
+        steps.append(lambda item: f"{prefix}{item}")
+    if processing_normalize in _NORMALIZERS:
+        steps.append(_NORMALIZERS[processing_normalize])
+    direct = _NORMALIZERS.get(normalize_type)
+    if not steps and direct is None:
+        return None
+    if steps and direct is not None:
+        # Les étapes produisent des chaînes : la normalisation directe rejoint la chaîne
+        # mémorisée (une recherche de cache par élément au lieu de deux)
+        steps.append(direct)
+        direct = None
     
-    def process_single_item(item):
-        processed_item = item
-        if prefix:
-            processed_item = f"{prefix}{processed_item}"
-        if processing_normalize == 'keyword':
-            processed_item = normalize_keyword(processed_item)
-        elif processing_normalize == 'person_name':
-            processed_item = normalize_person_name(processed_item)
-        return processed_item
+    if direct is not None:
+        # Normalisation directe seule (déjà mémorisée par le normaliseur)
+        def transform(value):
+            if not value:
+                return value
+            if isinstance(value, list):
+                return list(map(direct, value))
+            return direct(str(value))
+        return transform
     
-    if isinstance(value, list):
-        return [process_single_item(item) for item in value]
+    if len(steps) == 1 and not prefix:
+        # Normalisation seule : le normaliseur est déjà mémorisé, pas de second cache
+        process_single_item = steps[0]
     else:
-        return process_single_item(value)
-
-def _apply_direct_normalization(value: any, normalize_type: str) -> any:
-    """Applique la normalisation directe selon le type spécifié."""
-    if not normalize_type or not value:
-        return value
+        # Mêmes personnes et albums d'un sidecar à l'autre : la chaîne complète est mémorisée
+        # (préfixe compris), une seule recherche par élément ; le préfixe n'est donc concaténé
+        # qu'une fois par album distinct sur toute l'exécution
+        @functools.lru_cache(maxsize=8192)
+        def process_single_item(item):
+            for step in steps:
+                item = step(item)
+            return item
     
-    if normalize_type == 'person_name':
-        if isinstance(value, list):
-            return [normalize_person_name(item) for item in value]
-        else:
-            return normalize_person_name(str(value))
-    elif normalize_type == 'keyword':
+    # Étapes choisies une fois par mapping : aucun test répété par appel ni par élément
+    def transform(value):
         if isinstance(value, list):
-            return [normalize_keyword(item) for item in value]
-        else:
-            return normalize_keyword(str(value))
+            return list(map(process_single_item, value))
+        return process_single_item(value)
     
-    return value
+    return transform
 
 def _apply_value_mapping(value: any, value_mapping: dict) -> any:
     """Applique le mapping de valeurs selon la configuration."""
@@ -369,56 +902,75 @@ def _apply_value_mapping(value: any, value_mapping: dict) -> any:
     
     return value
 
-def _build_condition_args(condition_template: str, tag: str) -> list[str]:
-    """Construit les arguments de condition pour ExifTool."""
+def _build_condition_args(condition_template: str, tag: str) -> tuple[str, ...]:
+    """Construit les arguments de condition pour ExifTool (ne dépendent que du template et du tag)."""
     if not condition_template:
-        return []
-    
+        return ()
+    return _compile_condition(condition_template, tag)
+
+@functools.lru_cache(maxsize=1024)
+def _compile_condition(condition_template: str, tag: str) -> tuple[str, ...]:
     condition = condition_template.replace('${tag}', tag)
     
     if condition.startswith('-if'):
         # Extraire la condition après "-if "
         condition_value = condition[4:].strip()
-        return ["-if", condition_value]
+        return ("-if", condition_value)
     else:
-        return [condition]
+        return (condition,)
 
 def _build_pattern_args(pattern: list, tag: str, value: any) -> list[str]:
     """Construit les arguments basés sur des patterns personnalisés."""
     if not pattern:
         return []
     
-    args = []
-    
+    templates = _compile_patterns(tuple(pattern), tag)
+    # Pour les listes, chaque élément est traité individuellement (converti une seule fois)
     if isinstance(value, list):
-        # Pour les patterns avec listes, traiter chaque élément individuellement
-        for item in value:
-            for pattern_template in pattern:
-                arg = pattern_template.replace('${tag}', tag).replace('${value}', str(item))
-                # Les arguments doivent commencer par -
-                if not arg.startswith('-'):
-                    arg = f'-{arg}'
-                args.append(arg)
-    else:
-        # Pattern simple pour valeurs uniques
-        for pattern_template in pattern:
-            arg = pattern_template.replace('${tag}', tag).replace('${value}', str(value))
-            # Les arguments doivent commencer par -
-            if not arg.startswith('-'):
-                arg = f'-{arg}'
-            args.append(arg)
+        return [item.join(segments) for item in map(str, value) for segments in templates]
+    value = str(value)
+    return [value.join(segments) for segments in templates]
+
+@functools.lru_cache(maxsize=1024)
+def _compile_patterns(pattern: tuple[str, ...], tag: str) -> tuple[tuple[str, ...], ...]:
+    """Tous les templates d'une stratégie pour un tag : une recherche de cache par appel."""
+    return tuple(_compile_pattern(pattern_template, tag) for pattern_template in pattern)
+
+@functools.lru_cache(maxsize=1024)
+def _compile_pattern(pattern_template: str, tag: str) -> tuple[str, ...]:
+    """Découpe un template autour de ``${value}`` (``${tag}`` substitué, préfixe '-' garanti).
     
-    return args
+    L'argument final est ``valeur.join(segments)`` : aucun balayage du template par élément.
+    """
+    template = pattern_template.replace('${tag}', tag)
+    # Les arguments doivent commencer par -
+    if not template.startswith('-'):
+        template = f'-{template}'
+    return tuple(template.split('${value}'))
+
+@functools.lru_cache(maxsize=65536)
+def _tag_arg(tag: str, value: str) -> str:
+    """``-TAG=VALUE`` partagé : les éléments de listes (personnes, mots-clés) reviennent d'un fichier à l'autre."""
+    return f"-{tag}={value}"
+
+@functools.lru_cache(maxsize=None)
+def _tag_prefix(tag: str) -> str:
+    """Préfixe ``-TAG=`` construit une fois par tag.
+    
+    Pour les valeurs simples (dates, description, titre, GPS), presque toujours uniques par
+    fichier, une concaténation coûte bien moins qu'un échec de ``_tag_arg``.
+    """
+    return f"-{tag}="
 
 def _build_simple_tag_args(tag: str, value: any) -> list[str]:
     """Construit les arguments simples tag=value."""
     if isinstance(value, list):
         # Pour les listes, ajouter chaque élément séparément
-        return [f"-{tag}={item}" for item in value]
+        return [_tag_arg(tag, str(item)) for item in value]
     else:
-        return [f"-{tag}={value}"]
+        return [_tag_prefix(tag) + str(value)]
 
-def _build_preserve_positive_rating_args(tag: str, value: any) -> list[str]:
+def _build_preserve_positive_rating_args(tag: str, value: any) -> tuple[str, ...]:
     """Logique spéciale pour preserve_positive_rating (favorited/Rating et favorited/Label).
     
     Si favorited=true ET tag>0 existant → ne pas toucher (preserve)
@@ -430,88 +982,83 @@ def _build_preserve_positive_rating_args(tag: str, value: any) -> list[str]:
     """
     if not value or value is None:
         # Valeur nulle ou fausse → ne jamais toucher au tag
-        return []
+        return ()
     
+    # Si nous avons une valeur mappée valide, écrire avec conditions de préservation
+    return ("-if", _preserve_rating_condition(tag), _tag_arg(tag, value))
+
+@functools.lru_cache(maxsize=None)
+def _preserve_rating_condition(tag: str) -> str:
+    """Condition ``-if`` de preserve_positive_rating, construite une fois par tag."""
     # Extraire le nom court du tag pour les conditions ExifTool
     # Ex: "XMP:Rating" -> "Rating", "XMP:Label" -> "Label"
     short_tag = tag.split(':')[-1]
-    
-    # Si nous avons une valeur mappée valide, écrire avec conditions de préservation
     if 'Rating' in tag:
         # Pour Rating, tester les conditions 0 et absence
-        return [
-            "-if", f"not defined ${short_tag} or ${short_tag} eq '0' or ${short_tag} eq 0",
-            f"-{tag}={value}"
-        ]
-    else:
-        # Pour Label et autres, tester seulement l'absence ou vide
-        return [
-            "-if", f"not defined ${short_tag} or not length(${short_tag}) or ${short_tag} eq ''",
-            f"-{tag}={value}"
-        ]
+        return f"not defined ${short_tag} or ${short_tag} eq '0' or ${short_tag} eq 0"
+    # Pour Label et autres, tester seulement l'absence ou vide
+    return f"not defined ${short_tag} or not length(${short_tag}) or ${short_tag} eq ''"
 
-def _build_tag_args(tag: str, value: any, strategy_config: dict, mapping_config: dict, is_video: bool = False, use_localTime: bool = False) -> list[str]:
-    """Construit les arguments pour un tag spécifique selon la stratégie."""
-    args = []
-    
+def _value_key(value_settings: tuple) -> tuple:
+    """Clé de ``_prepare_value`` d'après ``MappingPlan.value_settings`` (hors valeur source)."""
+    format_template, prefix, processing_normalize, normalize = value_settings
+    return format_template, _value_transform(prefix, processing_normalize, normalize)
+
+def _prepare_value(value: any, value_key: tuple, use_localTime: bool = False) -> any:
+    """Étapes indépendantes du tag cible : formatage de date, traitement et normalisation."""
+    format_template, value_transform = value_key
     # 1. Appliquer le formatage de timestamp si nécessaire
-    format_template = mapping_config.get('format')
     value = _format_timestamp_value(value, format_template, use_localTime)
 
-    # 2. Appliquer le traitement (prefix, normalisation)
-    processing = mapping_config.get('processing', {})
-    value = _apply_processing_to_value(value, processing)
+    # 2. Appliquer le traitement (prefix, normalisation), 3. puis la normalisation directe
+    if value_transform is not None:
+        value = value_transform(value)
     
-    # 3. Appliquer la normalisation directe si spécifiée
-    normalize_type = mapping_config.get('normalize')
-    value = _apply_direct_normalization(value, normalize_type)
-    
-    # 4. Appliquer transformation si spécifiée (ex: boolean_to_rating)
-    transform = mapping_config.get('transform')
-    if transform == 'boolean_to_rating' and isinstance(value, bool):
-        return make_rating_args(value)
+    # 3.5. Dédupliquer les listes (ordre préservé) : des noms qui ne différaient que par la
+    # casse deviennent identiques après normalisation et produiraient des paires -=/+= redondantes
+    if isinstance(value, list):
+        value = list(dict.fromkeys(value))
+    return value
+
+def _fixed_point(tag: str, value: float) -> str:
+    """Virgule fixe : str(float) peut produire "1e-05", mal interprété par exiftool.
     
-    # 5. Appliquer value_mapping si présent
-    value_mapping = mapping_config.get('value_mapping', {})
-    mapped_value = _apply_value_mapping(value, value_mapping)
-    if mapped_value is None:
-        # Valeur mappée à null = ignorer
-        return []
-    value = mapped_value
+    7 décimales ≈ 11 mm pour les coordonnées, altitude au millimètre.
+    """
+    return format(value, ".3f" if "Altitude" in tag else ".7f")
+
+def _build_tag_args(tag: str, value: any, strategy: 'StrategyPlan') -> tuple[str, ...]:
+    """Construit les arguments pour un tag spécifique selon la stratégie.
     
+    ``value`` est déjà préparée par ``_prepare_value`` et mappée (étapes 4-5) par
+    ``_iter_tag_args``, une fois par mapping et par fichier.
+    Le tuple retourné sert aussi de clé de déduplication dans ``_group_args_by_strategy``.
+    """
     # 5.5. Logique spéciale pour preserve_positive_rating (favorited/Rating et Label)
-    # Détecter la stratégie preserve_positive_rating directement
-    default_strategy = mapping_config.get('default_strategy', '')
-    special_logic = strategy_config.get('special_logic')
-    
-    if default_strategy == 'preserve_positive_rating' or special_logic == 'favorited_rating':
-        logger.debug(f"Utilisation de la logique spéciale preserve_positive_rating pour {tag} avec valeur {value}")
+    if strategy.special_logic:
+        logger.debug("Utilisation de la logique spéciale preserve_positive_rating pour %s avec valeur %s", tag, value)
         special_args = _build_preserve_positive_rating_args(tag, value)
-        logger.debug(f"Arguments spéciaux générés: {special_args}")
+        logger.debug("Arguments spéciaux générés: %s", special_args)
         return special_args
     
-    # 6. Arguments de stratégie de base
-    strategy_args = strategy_config.get('exiftool_args', [])
-    args.extend(strategy_args)
+    if isinstance(value, float):
+        value = _fixed_point(tag, value)
     
-    # 7. Condition template si présente
-    condition_template = strategy_config.get('condition_template')
-    condition_args = _build_condition_args(condition_template, tag)
-    args.extend(condition_args)
-    
-    # 8. Pattern personnalisé ou arguments simples
-    pattern = strategy_config.get('pattern')
+    # 8. Pattern personnalisé ou arguments simples (valeur scalaire : tuple direct, sans liste)
+    pattern = strategy.pattern
     if pattern:
-        pattern_args = _build_pattern_args(pattern, tag, value)
-        args.extend(pattern_args)
+        body = _build_pattern_args(pattern, tag, value)
+    elif isinstance(value, list):
+        body = _build_simple_tag_args(tag, value)
     else:
-        simple_args = _build_simple_tag_args(tag, value)
-        args.extend(simple_args)
+        body = (_tag_prefix(tag) + str(value),)
     
-    return args
+    # 6. Arguments de stratégie de base, 7. condition template si présente : un seul tuple
+    return (*strategy.exiftool_args, *_build_condition_args(strategy.condition_template, tag), *body)
 
 def enhance_args_with_timezone_correction(args: list[str], meta: SidecarData, 
-                                        media_path: Path, timezone_config: dict) -> list[str]:
+                                        media_path: Path, timezone_config: dict,
+                                        is_video: bool | None = None) -> list[str]:
     """
     Enrichit les arguments ExifTool avec la correction de timezone si activée.
     
@@ -520,6 +1067,7 @@ def enhance_args_with_timezone_correction(args: list[str], meta: SidecarData,
         meta: Métadonnées sidecar
         media_path: Chemin du fichier média
         timezone_config: Configuration timezone directe
+        is_video: Type du fichier s'il est déjà connu (déduit de l'extension si None)
         
     Returns:
         Arguments ExifTool enrichis avec correction timezone
@@ -530,7 +1078,7 @@ def enhance_args_with_timezone_correction(args: list[str], meta: SidecarData,
     
     # Vérifier si on a les données nécessaires (GPS + timestamp)
     if not (meta.geoData_latitude and meta.geoData_longitude and meta.photoTakenTime_timestamp):
-        logger.debug(f"Données GPS ou timestamp manquantes pour {media_path}")
+        logger.debug("Données GPS ou timestamp manquantes pour %s", media_path)
         return args
     
     try:
@@ -547,22 +1095,23 @@ def enhance_args_with_timezone_correction(args: list[str], meta: SidecarData,
         )
         
         if not tz_info:
-            logger.warning(f"Impossible de calculer timezone pour {media_path}")
+            logger.warning("Impossible de calculer timezone pour %s", media_path)
             return args
         
         # Générer les arguments de correction
         generator = TimezoneExifArgsGenerator(calc)
-        is_video = _is_video_file(media_path)
+        if is_video is None:
+            is_video = _is_video_file(media_path)
         
         if is_video:
             # Pour les vidéos, ajouter les args UTC spécifiques
             tz_args = generator.generate_video_args(media_path, meta.photoTakenTime_timestamp)
-            logger.info(f"Correction timezone vidéo pour {media_path}: UTC (offset {tz_info.offset_string})")
+            logger.info("Correction timezone vidéo pour %s: UTC (offset %s)", media_path, tz_info.offset_string)
         else:
             # Pour les images, utiliser valeurs absolues ou shift
             use_absolute = timezone_config.get('use_absolute_values', True)
             tz_args = generator.generate_image_args(media_path, tz_info, use_absolute)
-            logger.info(f"Correction timezone image pour {media_path}: {tz_info.timezone_name} ({tz_info.offset_string})")
+            logger.info("Correction timezone image pour %s: %s (%s)", media_path, tz_info.timezone_name, tz_info.offset_string)
         
         # Filtrer les arguments de fichier (déjà dans args principal)
         filtered_tz_args = [arg for arg in tz_args if str(media_path) not in arg and '-overwrite_original' not in arg]
@@ -572,31 +1121,54 @@ def enhance_args_with_timezone_correction(args: list[str], meta: SidecarData,
         return enhanced_args
         
     except Exception as e:
-        logger.error(f"Erreur correction timezone pour {media_path}: {e}")
+        logger.error("Erreur correction timezone pour %s: %s", media_path, e)
         return args
 
+# Tags de dates qui peuvent être écrasés par timezone
+_TZ_DATE_TAGS = (
+    'DateTimeOriginal', 'CreateDate', 'OffsetTimeOriginal',
+    'OffsetTimeDigitized', 'OffsetTime', 'QuickTime:CreateDate',
+    'QuickTime:ModifyDate', 'TrackCreateDate', 'MediaCreateDate'
+)
+_TZ_DATE_TAG_RE = re.compile('|'.join(map(re.escape, _TZ_DATE_TAGS)))
+
+def _is_tz_date_arg(arg: str) -> bool:
+    """Argument ``-<tag>=...`` dont le nom de tag (avant le premier '=') contient un tag de date.
+    
+    Recherche limitée au nom de tag, sans retour arrière sur le reste de l'argument
+    (temps linéaire même pour une longue liste de valeurs).
+    """
+    name, sep, _ = arg.partition('=')
+    return bool(sep) and name[:1] == '-' and _TZ_DATE_TAG_RE.search(name) is not None
+
 def _merge_timezone_args(base_args: list[str], tz_args: list[str]) -> list[str]:
     """
     Fusionne intelligemment les arguments timezone avec les arguments de base.
     Les arguments timezone ont priorité sur les arguments de dates existants.
     """
-    # Tags de dates qui peuvent être écrasés par timezone
-    date_tags = {
-        'DateTimeOriginal', 'CreateDate', 'OffsetTimeOriginal', 
-        'OffsetTimeDigitized', 'OffsetTime', 'QuickTime:CreateDate',
-        'QuickTime:ModifyDate', 'TrackCreateDate', 'MediaCreateDate'
-    }
-    
     # Filtrer les arguments de base qui seraient en conflit
     filtered_base = []
     for arg in base_args:
-        if arg.startswith('-') and '=' in arg:
-            tag_part = arg.split('=')[0][1:]  # Enlever le '-' et prendre la partie avant '='
-            if any(date_tag in tag_part for date_tag in date_tags):
-                logger.debug(f"Remplacement argument date: {arg}")
-                continue
+        if _is_tz_date_arg(arg):
+            logger.debug("Remplacement argument date: %s", arg)
+            continue
         filtered_base.append(arg)
     
     # Combiner les arguments filtrés avec les nouveaux
     return filtered_base + tz_args
 
+# Caches de module : bornés, mais conservés d'une exécution à l'autre sans clear_caches
+_CACHES = (
+    normalize_person_name, normalize_keyword, _format_timestamp, _value_transform,
+    _compile_condition, _compile_patterns, _compile_pattern, _tag_arg, _tag_prefix,
+    _preserve_rating_condition,
+)
+
+def clear_caches() -> None:
+    """Vide les caches de module (noms normalisés, arguments, transformations de valeurs).
+    
+    Appelé au début de chaque traitement de répertoire : une exécution ne garde pas les
+    valeurs ni les transformations d'une configuration précédente.
+    """
+    for cached in _CACHES:
+        cached.cache_clear()
@@ -12,6 +12,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -19,6 +20,9 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+# Plusieurs threads (``--workers``) peuvent enrichir le cache en même temps
+_cache_lock = threading.Lock()
+
 
 
 def _cache_file() -> Path:
@@ -49,13 +53,19 @@ def _load_cache() -> Dict[str, Any]:
 
 
 def _save_cache(cache: Dict[str, Any]) -> None:
-    """Sauvegarder le cache sur le disque."""
+    """Sauvegarder le cache sur le disque.
+
+    Écriture dans un fichier temporaire puis ``os.replace`` : un lecteur ne voit
+    jamais de fichier à moitié écrit.
+    """
 
     cache_file = _cache_file()
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
         cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with cache_file.open("w", encoding="utf-8") as f:
+        with tmp_file.open("w", encoding="utf-8") as f:
             json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
     except OSError as exc:
         logger.warning("Impossible d'écrire le cache de géocodage: %s", exc)
 
@@ -111,6 +121,9 @@ def reverse_geocode(lat: float, lon: float) -> List[Dict[str, Any]]:
         raise RuntimeError(f"Erreur de l'API de géocodage: {status}")
 
     results = data.get("results", [])
-    cache[key] = results
-    _save_cache(cache)
+    with _cache_lock:
+        # Relire le cache : d'autres threads ont pu l'enrichir pendant la requête
+        cache = _load_cache()
+        cache[key] = results
+        _save_cache(cache)
     return results
@@ -11,7 +11,8 @@ import os
 from datetime import datetime
 
 from .sidecar import parse_sidecar, find_albums_for_directory
-from .exif_writer import write_metadata
+from .exif_writer import ExifToolDaemon, ExifToolPool, clear_caches, get_daemon, write_metadata
+from .config_loader import ConfigLoader
 from . import sidecar_safety
 from . import statistics
 from . import geocoding
@@ -20,8 +21,9 @@ from .file_organizer import FileOrganizer, should_organize_file
 logger = logging.getLogger(__name__)
 
 # Séparer les extensions images et vidéos pour une meilleure cohérence
-IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif", ".avif"}
-VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".3gp"}
+# Ensembles figés : constantes partagées, testées à chaque fichier
+IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif", ".avif"})
+VIDEO_EXTS = frozenset({".mp4", ".mov", ".m4v", ".3gp"})
 ALL_MEDIA_EXTS = IMAGE_EXTS | VIDEO_EXTS
 
 
@@ -32,30 +34,31 @@ def detect_file_type(file_path: Path) -> str | None:
         L'extension correcte (avec point) ou ``None`` si la détection échoue
     """
     try:
-        # Essayer d'abord la commande ``file`` (disponible sur la plupart des systèmes)
+        # Essayer d'abord la commande ``file`` (disponible sur la plupart des systèmes).
+        # Sortie brute (-b : sans le nom du fichier) comparée en octets : rien à décoder,
+        # et un nom de fichier non UTF-8 ne peut pas faire échouer la détection
         result = subprocess.run(
-            ["file", str(file_path)], 
+            ["file", "-b", str(file_path)], 
             capture_output=True, 
-            text=True, 
             timeout=10
         )
         if result.returncode == 0:
             output = result.stdout.lower()
-            if "jpeg" in output or "jfif" in output:
+            if b"jpeg" in output or b"jfif" in output:
                 return ".jpg"
-            elif "png" in output:
+            elif b"png" in output:
                 return ".png"
-            elif "gif" in output:
+            elif b"gif" in output:
                 return ".gif"
-            elif "webp" in output:
+            elif b"webp" in output:
                 return ".webp"
-            elif "heic" in output:
+            elif b"heic" in output:
                 return ".heic"
-            elif "heif" in output:
+            elif b"heif" in output:
                 return ".heif"
-            elif "mp4" in output:
+            elif b"mp4" in output:
                 return ".mp4"
-            elif "quicktime" in output or "mov" in output:
+            elif b"quicktime" in output or b"mov" in output:
                 return ".mov"
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
         pass
@@ -216,13 +219,13 @@ def _organize_file_if_needed(media_path: Path, json_path: Path, meta, organize_f
         
         # Mettre à jour les chemins si déplacement effectué
         if new_media_path and new_sidecar_path:
-            logger.info(f"📁 Fichier organisé selon statut: {meta.title}")
+            logger.info("📁 Fichier organisé selon statut: %s", meta.title)
             return new_media_path, new_sidecar_path
         else:
             return media_path, json_path
             
     except (OSError, shutil.Error) as exc:
-        logger.warning(f"Échec de l'organisation du fichier {media_path.name}: {exc}")
+        logger.warning("Échec de l'organisation du fichier %s: %s", media_path.name, exc)
         # Continuer le traitement même si l'organisation échoue
         return media_path, json_path
 
@@ -267,7 +270,22 @@ def _enrich_with_reverse_geocode(meta, json_path: Path, geocode: bool) -> None:
     meta.place_name = first.get("formatted_address") or meta.place_name
 
 
-def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False) -> None:
+def directory_albums_for(directory: Path, albums_cache: dict[Path, list[str]] | None = None) -> list[str]:
+    """Albums applicables à ``directory``, recherchés une seule fois par répertoire si ``albums_cache`` est fourni.
+    
+    Tous les sidecars d'un dossier partagent les mêmes fichiers d'album : sans cache, chaque
+    fichier relirait le dossier et ses parents.
+    """
+    if albums_cache is None:
+        return find_albums_for_directory(directory)
+    albums = albums_cache.get(directory)
+    if albums is None:
+        albums = albums_cache[directory] = find_albums_for_directory(directory)
+    return albums
+
+def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False,
+                         config_loader: ConfigLoader | None = None, daemon: ExifToolDaemon | None = None,
+                         albums_cache: dict[Path, list[str]] | None = None) -> None:
     """Traiter un fichier annexe ``.json``.
     
     Args:
@@ -277,6 +295,9 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
                          (par défaut: mode sécurisé avec préfixe OK_)
         organize_files: Organiser les fichiers selon leur statut (archivé/supprimé)
         geocode: Activer le géocodage inverse (False par défaut; nécessite GOOGLE_MAPS_API_KEY)
+        config_loader: Configuration partagée entre fichiers (chargée à chaque appel si None)
+        daemon: Démon exiftool à utiliser, ex: un par thread (démon global si None)
+        albums_cache: Albums déjà trouvés par répertoire, partagés entre fichiers (recherche à chaque appel si None)
     """
     
     # Vérifier si ce sidecar a déjà été traité (préfixe OK_)
@@ -294,7 +315,7 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
     _enrich_with_reverse_geocode(meta, json_path, geocode)
 
     # Trouver les albums du répertoire
-    directory_albums = find_albums_for_directory(json_path.parent)
+    directory_albums = directory_albums_for(json_path.parent, albums_cache)
     meta.albums.extend(directory_albums)
     
     media_path = json_path.with_name(meta.title)
@@ -308,7 +329,7 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
     
     # Tenter d'écrire les métadonnées dans l'image
     try:
-        write_metadata(media_path, meta, use_localTime=use_localTime)
+        write_metadata(media_path, meta, use_localTime=use_localTime, config_loader=config_loader, daemon=daemon)
         current_json_path = json_path
         
         # Enregistrer le succès
@@ -338,10 +359,10 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
 
                 meta = parse_sidecar(actual_json_path)
                 _enrich_with_reverse_geocode(meta, actual_json_path, geocode)
-                directory_albums = find_albums_for_directory(actual_json_path.parent)
+                directory_albums = directory_albums_for(actual_json_path.parent, albums_cache)
                 meta.albums.extend(directory_albums)
                 
-                write_metadata(fixed_media_path, meta, use_localTime=use_localTime)
+                write_metadata(fixed_media_path, meta, use_localTime=use_localTime, config_loader=config_loader, daemon=daemon)
                 current_json_path = actual_json_path
                 
                 # Enregistrer le succès après correction
@@ -364,7 +385,7 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
         # Mode destructeur : suppression immédiate (ancien comportement)
         try:
             current_json_path.unlink()
-            statistics.stats.sidecars_cleaned += 1
+            statistics.stats.add_sidecars_cleaned(1)
             logger.info("🗑️ Fichier de métadonnées supprimé : %s", current_json_path.name)
         except OSError as exc:
             logger.warning("Échec de la suppression du fichier de métadonnées %s : %s", current_json_path, exc)
@@ -372,13 +393,14 @@ def process_sidecar_file(json_path: Path, use_localTime: bool = False, immediate
         # Mode sécurisé : marquage avec préfixe OK_ (nouveau comportement par défaut)
         try:
             if sidecar_safety.mark_sidecar_as_processed(current_json_path):
-                statistics.stats.sidecars_cleaned += 1  # Compteur réutilisé pour les "traités"
+                statistics.stats.add_sidecars_cleaned(1)  # Compteur réutilisé pour les "traités"
                 logger.info("✅ Sidecar marqué comme traité : %s", current_json_path.name)
         except OSError as exc:
             logger.warning("Échec du marquage du sidecar %s : %s", current_json_path, exc)
 
 
-def process_directory(root: Path, use_localTime: bool = False, immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False) -> None:
+def process_directory(root: Path, use_localTime: bool = False, immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False,
+                      workers: int = 1) -> None:
     """Traiter récursivement tous les fichiers annexes sous ``root``.
     
     Args:
@@ -388,6 +410,7 @@ def process_directory(root: Path, use_localTime: bool = False, immediate_delete:
                          (par défaut: mode sécurisé avec préfixe OK_)
         organize_files: Organiser les fichiers selon leur statut (archivé/supprimé)
         geocode: Activer le géocodage inverse si l'API est disponible
+        workers: Nombre de fichiers écrits en parallèle, un démon exiftool chacun (1 = séquentiel)
     """
     
     # Initialiser les statistiques
@@ -415,14 +438,40 @@ def process_directory(root: Path, use_localTime: bool = False, immediate_delete:
 
     logger.info("🔍 Traitement de %d fichier(s) de métadonnées dans %s", statistics.stats.total_sidecars_found, root)
     
-    for json_file in sidecar_files:
-            
+    # Démarrer exiftool maintenant : son chargement recouvre celui de la config et des sidecars.
+    # Avec plusieurs workers, chaque thread du pool emprunte un démon libre
+    # Pas plus de démons (un interpréteur Perl chacun) que de fichiers à écrire
+    workers = min(workers, len(sidecar_files))
+    pool = ExifToolPool(workers) if workers > 1 else None
+    if pool is not None:
+        pool.warm_up()
+    else:
+        get_daemon().warm_up()
+    
+    # Une seule configuration (et un seul plan de mappings) pour tout le répertoire
+    clear_caches()
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    # Albums par répertoire, pour toute l'exécution (threads : au pire une recherche en double)
+    albums_cache: dict[Path, list[str]] = {}
+    
+    def process_one(json_file: Path, daemon: ExifToolDaemon | None = None) -> None:
         try:
-            process_sidecar_file(json_file, use_localTime=use_localTime, immediate_delete=immediate_delete, organize_files=organize_files, geocode=geocode)
+            process_sidecar_file(json_file, use_localTime=use_localTime, immediate_delete=immediate_delete, organize_files=organize_files, geocode=geocode,
+                                 config_loader=config_loader, daemon=daemon, albums_cache=albums_cache)
         except (FileNotFoundError, ValueError, RuntimeError) as exc:
             logger.warning("❌ Échec du traitement de %s : %s", json_file.name, exc)
             # Les statistiques sont déjà mises à jour dans process_sidecar_file
     
+    if pool is not None:
+        with pool:
+            # Consommer le résultat propage une éventuelle exception inattendue
+            for _ in pool.map(process_one, sidecar_files):
+                pass
+    else:
+        for json_file in sidecar_files:
+            process_one(json_file)
+    
     statistics.stats.end_processing()
     
     # Affichage du résumé
@@ -1,19 +1,22 @@
 import logging
 import subprocess
-import tempfile
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import List, Sequence, Tuple, Union
 from datetime import datetime
 import shutil
+import queue
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from .exif_writer import build_exiftool_args
+from .exif_writer import _argfile_path, argfile_line, build_exiftool_transactions, clear_caches
 from .config_loader import ConfigLoader
-from .sidecar import find_albums_for_directory, parse_sidecar
+from .sidecar import parse_sidecar
 from .processor import (
     IMAGE_EXTS,
     fix_file_extension_mismatch,
     _is_sidecar_file,
     _enrich_with_reverse_geocode,
+    directory_albums_for,
 )
 from . import sidecar_safety
 from . import statistics
@@ -24,27 +27,94 @@ logger = logging.getLogger(__name__)
 
 
 
-def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: bool, efile_dir: Union[str, Path] = "logs") -> int:
-    """Traiter un lot de fichiers avec exiftool via un fichier d'arguments."""
+# Options -efile et noms des logs correspondants (lus par resume_handler)
+_EFILE_LOGS = (
+    ("-efile1", "error_files"),              # errors = 1
+    ("-efile2", "unchanged_files"),          # unchanged = 2
+    ("-efile4", "failed_condition_files"),   # failed -if condition = 4
+    ("-efile8", "updated_files"),            # updated = 8
+)
+
+
+def _merge_efile_logs(efile_dir: Path, suffixes: Sequence[str]) -> None:
+    """Ajoute les logs -efile propres à chaque worker aux logs communs, puis les supprime.
+    
+    Chaque processus exiftool parallèle écrit dans ses propres fichiers : les lignes
+    ne s'entremêlent pas, et les logs communs restent ceux lus par ``resume_handler``.
+    """
+    for _, name in _EFILE_LOGS:
+        target = efile_dir / f"{name}.txt"
+        for suffix in suffixes:
+            part = efile_dir / f"{name}{suffix}.txt"
+            if not part.exists():
+                continue
+            try:
+                with target.open("ab") as merged:
+                    merged.write(part.read_bytes())
+                part.unlink()
+            except OSError as e:
+                logger.warning("Échec de la fusion du log %s : %s", part.name, e)
+
+
+def _decode_output(data: bytes | None) -> str:
+    """Décode une sortie exiftool brute (UTF-8) ; chaîne vide si absente."""
+    return data.decode("utf-8", "replace") if data else ""
+
+
+def _join_transactions(transactions: List[List[str]], media_path: Path) -> List[Union[str, Path]]:
+    """Aplatit les transactions d'un fichier en sections ``-execute`` successives.
+    
+    Le chemin reste un ``Path`` entre deux sections : ``process_batch`` l'encode comme les
+    autres chemins (octets du système de fichiers), et ajoute le chemin et ``-execute``
+    après la dernière section.
+    """
+    args: List[Union[str, Path]] = []
+    for transaction in transactions[:-1]:
+        args.extend(transaction)
+        args.extend((media_path, "-execute"))
+    args.extend(transactions[-1])
+    return args
+
+
+def _argfile_bytes(arg: Union[str, Path]) -> bytes:
+    """Ligne du fichier d'arguments : chemin en octets du système de fichiers, sinon UTF-8."""
+    if isinstance(arg, Path):
+        return _argfile_path(arg)
+    return argfile_line(arg).encode("utf-8")
+
+
+def process_batch(batch: List[Tuple[Path, Path, List[Union[str, Path]]]], immediate_delete: bool, efile_dir: Union[str, Path] = "logs",
+                  common_args: Sequence[str] = (), efile_suffix: str = "") -> int:
+    """Traiter un lot de fichiers avec exiftool via un fichier d'arguments.
+    
+    ``common_args`` (ex: ``global_settings.common_args``) est passé une seule fois après
+    ``-common_args`` au lieu d'être répété dans chaque section du fichier d'arguments.
+    ``efile_suffix`` distingue les logs -efile d'un worker (ex: ``error_files.1.txt``).
+    """
     if not batch:
         return 0
 
     # Convertir efile_dir en Path si nécessaire
     efile_dir = Path(efile_dir)
 
-    argfile_path = None
     try:
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8', suffix=".txt") as argfile:
-            argfile_path = argfile.name
-        
-        with open(argfile_path, 'w', encoding='utf-8') as argfile:
-            for media_path, _, args in batch:
-                for arg in args:
-                    argfile.write(f"{arg}\n")
-                argfile.write(f"{media_path}\n")
-                argfile.write("-execute\n")
+        # Fichier d'arguments transmis sur stdin (-@ -), sans fichier temporaire ; chemins
+        # en octets du système de fichiers.
+        # Les rafales d'un même album produisent souvent des arguments identiques : une seule
+        # section (échappée et encodée une fois) liste tous les fichiers concernés, exiftool
+        # l'applique à chacun (conditions -if comprises). Un fichier en plusieurs sections
+        # (transactions jointes) porte son chemin dans ses arguments : jamais regroupé.
+        sections: dict[tuple[Union[str, Path], ...], list[Path]] = {}
+        for media_path, _, args in batch:
+            sections.setdefault(tuple(args), []).append(media_path)
+        lines = []
+        for args, paths in sections.items():
+            lines.extend(map(_argfile_bytes, args))
+            lines.extend(map(_argfile_path, paths))
+            lines.append(b"-execute")
+        payload = b"\n".join(lines) + b"\n"
 
-        logger.info(f"📦 Traitement d'un lot de {len(batch)} fichier(s)...")
+        logger.info("📦 Traitement d'un lot de %s fichier(s)...", len(batch))
 
         # ✅ IMPLÉMENTATION -efile pour journalisation et reprises intelligentes
         # Répertoire de sortie pour les fichiers -efile (ex: logs/)
@@ -62,28 +132,32 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
             "-charset", "iptc=UTF8",        # For IPTC writing
             "-charset", "exif=UTF8",        # For EXIF writing
             "-codedcharacterset=utf8",      # For IPTC encoding (must be before -@)
-            "-@", argfile_path,
+            "-@", "-",                      # Argfile read from stdin
             "-common_args",                 # After -@ : applied to each block
+            *common_args,
             "-overwrite_original",
             "-q", "-q",
             "-api", "NoDups=1",            # For intra-batch deduplication
-            "-efile1", str(efile_dir / "error_files.txt"),                 # errors = 1
-            "-efile2", str(efile_dir / "unchanged_files.txt"),            # unchanged = 2  
-            "-efile4", str(efile_dir / "failed_condition_files.txt"),     # failed -if condition = 4
-            "-efile8", str(efile_dir / "updated_files.txt")               # updated = 8
+            *(arg for option, name in _EFILE_LOGS
+              for arg in (option, str(efile_dir / f"{name}{efile_suffix}.txt"))),
         ]
         
         timeout_seconds = 60 + (len(batch) * 5)
+        # Avec -q -q, stdout ne sert qu'au debug : inutile d'ouvrir un pipe sinon
+        stdout = subprocess.PIPE if logger.isEnabledFor(logging.DEBUG) else subprocess.DEVNULL
         result = subprocess.run(
-            cmd, capture_output=True, text=True, check=True, timeout=timeout_seconds, encoding='utf-8'
+            cmd, input=payload, stdout=stdout, stderr=subprocess.PIPE, check=True,
+            timeout=timeout_seconds
         )
         
-        # Analyser la sortie pour compter les fichiers traités
+        # Analyser la sortie pour compter les fichiers traités (décodée seulement si capturée)
         processed_count = 0
-        if result.stdout and result.stdout.strip():
-            stdout_lines = result.stdout.strip().split('\n')
+        stdout_text = _decode_output(result.stdout).strip()
+        if stdout_text:
+            stdout_lines = stdout_text.split('\n')
             for line in stdout_lines:
-                if 'image files updated' in line.lower() or 'files updated' in line.lower():
+                # "image files updated" contient "files updated" : une seule mise en minuscules
+                if 'files updated' in line.lower():
                     # Extraire le nombre de fichiers mis à jour
                     try:
                         numbers = [int(word) for word in line.split() if word.isdigit()]
@@ -91,12 +165,12 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                             processed_count = numbers[0]
                     except (ValueError, IndexError):
                         pass
-                    logger.info(f"✅ {line.strip()}")
+                    logger.info("✅ %s", line.strip())
         
         # Si on n'a pas pu extraire le nombre, utiliser la taille du lot
         if processed_count == 0:
             processed_count = len(batch)
-            logger.info(f"✅ Lot de {len(batch)} fichier(s) traité avec succès")
+            logger.info("✅ Lot de %s fichier(s) traité avec succès", len(batch))
         
         # Mettre à jour les statistiques pour chaque fichier du lot
         for media_path, _, _ in batch:
@@ -112,8 +186,8 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                     json_path.unlink()
                     cleaned_count += 1
                 except OSError as e:
-                    logger.warning(f"Échec de la suppression du fichier de métadonnées {json_path.name}: {e}")
-            statistics.stats.sidecars_cleaned += cleaned_count
+                    logger.warning("Échec de la suppression du fichier de métadonnées %s: %s", json_path.name, e)
+            statistics.stats.add_sidecars_cleaned(cleaned_count)
         else:
             # Mode sécurisé : marquage avec préfixe OK_
             marked_count = 0
@@ -122,21 +196,21 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                     if sidecar_safety.mark_sidecar_as_processed(json_path):
                         marked_count += 1
                 except OSError as e:
-                    logger.warning(f"Échec du marquage du sidecar {json_path.name}: {e}")
-            statistics.stats.sidecars_cleaned += marked_count  # Réutilise le compteur pour "traités"
+                    logger.warning("Échec du marquage du sidecar %s: %s", json_path.name, e)
+            statistics.stats.add_sidecars_cleaned(marked_count)  # Réutilise le compteur pour "traités"
         
         return len(batch)
 
     except FileNotFoundError as exc:
         raise RuntimeError("exiftool introuvable") from exc
     except subprocess.CalledProcessError as exc:
-        stderr_msg = exc.stderr or ""
-        stdout_msg = exc.stdout or ""
+        stderr_msg = _decode_output(exc.stderr)
+        stdout_msg = _decode_output(exc.stdout)
         
         # Analyser le type d'erreur pour donner un message plus clair
         if "files failed condition" in stderr_msg or "files failed condition" in stdout_msg:
-            logger.info(f"ℹ️ Lot traité avec conditions non remplies (normal en mode append-only). "
-                       f"Certaines métadonnées existaient déjà pour {len(batch)} fichier(s).")
+            logger.info("ℹ️ Lot traité avec conditions non remplies (normal en mode append-only). "
+                       "Certaines métadonnées existaient déjà pour %s fichier(s).", len(batch))
             # En mode append-only, considérer ceci comme un succès partiel
             for media_path, _, _ in batch:
                 is_image = media_path.suffix.lower() in IMAGE_EXTS
@@ -150,8 +224,8 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                         json_path.unlink()
                         cleaned_count += 1
                     except OSError as e:
-                        logger.warning(f"Échec de la suppression du fichier de métadonnées {json_path.name}: {e}")
-                statistics.stats.sidecars_cleaned += cleaned_count
+                        logger.warning("Échec de la suppression du fichier de métadonnées %s: %s", json_path.name, e)
+                statistics.stats.add_sidecars_cleaned(cleaned_count)
             else:
                 # Mode sécurisé : marquage avec préfixe OK_
                 marked_count = 0
@@ -160,13 +234,13 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                         if sidecar_safety.mark_sidecar_as_processed(json_path):
                             marked_count += 1
                     except OSError as e:
-                        logger.warning(f"Échec du marquage du sidecar {json_path.name}: {e}")
-                statistics.stats.sidecars_cleaned += marked_count
+                        logger.warning("Échec du marquage du sidecar %s: %s", json_path.name, e)
+                statistics.stats.add_sidecars_cleaned(marked_count)
             
             return len(batch)
         elif "doesn't exist or isn't writable" in stderr_msg:
-            logger.warning(f"⚠️ Certains champs de métadonnées non supportés par les fichiers du lot. "
-                          f"Normal pour vidéos ou certains formats. Détails: {stderr_msg.strip()}")
+            logger.warning("⚠️ Certains champs de métadonnées non supportés par les fichiers du lot. "
+                          "Normal pour vidéos ou certains formats. Détails: %s", stderr_msg.strip())
             # Considérer comme un succès partiel
             for media_path, _, _ in batch:
                 is_image = media_path.suffix.lower() in IMAGE_EXTS  
@@ -180,8 +254,8 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                         json_path.unlink()
                         cleaned_count += 1
                     except OSError as e:
-                        logger.warning(f"Échec de la suppression du fichier de métadonnées {json_path.name}: {e}")
-                statistics.stats.sidecars_cleaned += cleaned_count
+                        logger.warning("Échec de la suppression du fichier de métadonnées %s: %s", json_path.name, e)
+                statistics.stats.add_sidecars_cleaned(cleaned_count)
             else:
                 # Mode sécurisé : marquage avec préfixe OK_
                 marked_count = 0
@@ -190,18 +264,18 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
                         if sidecar_safety.mark_sidecar_as_processed(json_path):
                             marked_count += 1
                     except OSError as e:
-                        logger.warning(f"Échec du marquage du sidecar {json_path.name}: {e}")
-                statistics.stats.sidecars_cleaned += marked_count
+                        logger.warning("Échec du marquage du sidecar %s: %s", json_path.name, e)
+                statistics.stats.add_sidecars_cleaned(marked_count)
             
             return len(batch)
         elif "character(s) could not be encoded" in stderr_msg:
             error_type = "encoding_error"
             error_msg = "Problème d'encodage de caractères (émojis, accents)"
-            logger.warning(f"⚠️ {error_msg}. Détails: {stderr_msg.strip()}")
+            logger.warning("⚠️ %s. Détails: %s", error_msg, stderr_msg.strip())
         else:
             error_type = "exiftool_error"
             error_msg = f"Erreur exiftool (code {exc.returncode}): {stderr_msg.strip() or 'Erreur inconnue'}"
-            logger.exception(f"❌ Échec du traitement par lot de {len(batch)} fichier(s). {error_msg}")
+            logger.exception("❌ Échec du traitement par lot de %s fichier(s). %s", len(batch), error_msg)
         
         # Marquer tous les fichiers du lot comme échoués
         for media_path, _, _ in batch:
@@ -210,12 +284,10 @@ def process_batch(batch: List[Tuple[Path, Path, List[str]]], immediate_delete: b
         # NE PAS nettoyer les sidecars en cas d'échec exiftool - les garder pour retry
         # LOGIQUE MÉTIER: On ne supprime le sidecar QUE si le traitement a réussi
         return 0
-    finally:
-        if argfile_path and Path(argfile_path).exists():
-            Path(argfile_path).unlink()
 
 
-def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False) -> None:
+def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_delete: bool = False, organize_files: bool = False, geocode: bool = False,
+                            workers: int = 1) -> None:
     """Traiter récursivement tous les fichiers sidecar sous ``root`` par lots.
     
     Args:
@@ -225,11 +297,15 @@ def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_
                          (par défaut: mode sécurisé avec préfixe OK_)
         organize_files: Organiser les fichiers selon leur statut (archivé/supprimé/vérouillé)
         geocode: Activer le géocodage inverse si l'API est disponible
+        workers: Nombre de lots exiftool exécutés en parallèle (1 = séquentiel)
     """
-    batch: List[Tuple[Path, Path, List[str]]] = []
+    batch: List[Tuple[Path, Path, List[Union[str, Path]]]] = []
     BATCH_SIZE = 100
+    clear_caches()
     config_loader = ConfigLoader()
     config_loader.load_config()   
+    # Options communes à tous les fichiers : une fois par appel exiftool, pas par section
+    common_args = tuple(config_loader.config.get('global_settings', {}).get('common_args', []))
     # Initialiser les statistiques
     statistics.stats.start_processing()
     
@@ -275,26 +351,70 @@ def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_
 
     logger.info("🔍 Traitement par lots de %d fichier(s) de métadonnées dans %s", statistics.stats.total_sidecars_found, root)
 
+    # Avec plusieurs workers, chaque lot part dans son propre processus exiftool pendant que
+    # les lots suivants sont préparés ; au plus ``workers`` lots en attente à la fois
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exiftool-batch") if workers > 1 else None
+    pending: deque[Tuple[Future, list]] = deque()
+    # Un jeu de logs -efile par worker (fusionnés à la fin) : pas d'écritures concurrentes
+    efile_suffixes = [f".{slot}" for slot in range(workers)] if executor is not None else [""]
+    free_suffixes: queue.SimpleQueue[str] = queue.SimpleQueue()
+    for suffix in efile_suffixes:
+        free_suffixes.put(suffix)
+
+    def process_in_slot(batch):
+        suffix = free_suffixes.get()
+        try:
+            return process_batch(batch, immediate_delete, efile_dir=efile_dir, common_args=common_args,
+                                 efile_suffix=suffix)
+        finally:
+            free_suffixes.put(suffix)
+
+    def record_batch_failure(batch, exc):
+        # Échec d'exécution du lot : imputé à ses propres fichiers, pas au sidecar en préparation
+        error_msg = f"Échec du lot exiftool : {exc}"
+        logger.error("❌ %s (%d fichier(s))", error_msg, len(batch))
+        for media_path, _, _ in batch:
+            statistics.stats.add_failed_file(media_path, "exiftool_error", error_msg)
+
+    def collect(future, batch):
+        try:
+            future.result()
+        except (RuntimeError, OSError, subprocess.SubprocessError) as exc:
+            record_batch_failure(batch, exc)
+
+    def run_batch(batch):
+        if executor is None:
+            try:
+                process_batch(batch, immediate_delete, efile_dir=efile_dir, common_args=common_args)
+            except (RuntimeError, OSError, subprocess.SubprocessError) as exc:
+                record_batch_failure(batch, exc)
+            return
+        while len(pending) >= workers:
+            collect(*pending.popleft())
+        pending.append((executor.submit(process_in_slot, batch), batch))
+
+    # Albums recherchés une seule fois par répertoire
+    albums_cache: dict[Path, list[str]] = {}
     for json_path in sidecar_files:
         try:
             meta = parse_sidecar(json_path)
             _enrich_with_reverse_geocode(meta, json_path, geocode)
 
-            directory_albums = find_albums_for_directory(json_path.parent)
+            directory_albums = directory_albums_for(json_path.parent, albums_cache)
             meta.albums.extend(directory_albums)
             
             media_path = json_path.with_name(meta.title)
             if not media_path.exists():
                 error_msg = f"Fichier image introuvable : {meta.title}"
                 statistics.stats.add_failed_file(json_path, "file_not_found", error_msg)
-                logger.warning(f"❌ {error_msg}")
+                logger.warning("❌ %s", error_msg)
                 continue
 
             fixed_media_path, fixed_json_path = fix_file_extension_mismatch(media_path, json_path)
             if fixed_json_path != json_path:
                 meta = parse_sidecar(fixed_json_path)
                 _enrich_with_reverse_geocode(meta, fixed_json_path, geocode)
-                meta.albums.extend(find_albums_for_directory(fixed_json_path.parent))
+                meta.albums.extend(directory_albums_for(fixed_json_path.parent, albums_cache))
             
             # Organisation des fichiers si demandée
             if file_organizer and (meta.archived or meta.trashed or meta.inLockedFolder):
@@ -304,23 +424,23 @@ def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_
                         # Mettre à jour les chemins pour la suite du traitement
                         fixed_media_path = moved_media
                         fixed_json_path = moved_json
-                        logger.info(f"📁 Fichier organisé : {media_path.name} → {moved_media.parent.name}/")
+                        logger.info("📁 Fichier organisé : %s → %s/", media_path.name, moved_media.parent.name)
                 except (OSError, shutil.Error) as e:
-                    logger.warning(f"⚠️ Échec de l'organisation du fichier {media_path.name}: {e}")
+                    logger.warning("⚠️ Échec de l'organisation du fichier %s: %s", media_path.name, e)
             
-            args = build_exiftool_args(
-                meta, media_path=fixed_media_path, use_localTime=use_localTime, config_loader=config_loader
+            transactions = build_exiftool_transactions(
+                meta, media_path=fixed_media_path, use_localTime=use_localTime, config_loader=config_loader,
+                include_common_args=False
             )
 
-            if args:
-                batch.append((fixed_media_path, fixed_json_path, args))
+            if transactions:
+                batch.append((fixed_media_path, fixed_json_path, _join_transactions(transactions, fixed_media_path)))
             else:
                 # Aucun tag à écrire pour ce sidecar
-                statistics.stats.total_skipped += 1
-                statistics.stats.skipped_files.append(json_path.name)
+                statistics.stats.add_skipped_file(json_path, "Aucune métadonnée à écrire")
 
             if len(batch) >= BATCH_SIZE:
-                process_batch(batch, immediate_delete, efile_dir=efile_dir)
+                run_batch(batch)
                 batch = []
 
         except (ValueError, RuntimeError) as exc:
@@ -328,8 +448,15 @@ def process_directory_batch(root: Path, use_localTime: bool = False,  immediate_
             statistics.stats.add_failed_file(json_path, "preparation_error", error_msg)
             logger.warning("❌ Échec de la préparation de %s : %s", json_path.name, exc)
 
-    if batch:
-        process_batch(batch, immediate_delete, efile_dir=efile_dir)
+    try:
+        if batch:
+            run_batch(batch)
+        while pending:
+            collect(*pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+            _merge_efile_logs(efile_dir, efile_suffixes)
 
     statistics.stats.end_processing()
     
@@ -29,16 +29,22 @@ def should_resume(output_dir: Path) -> bool:
 def parse_efile_logs(output_dir: Path) -> Tuple[List[Path], List[Path], List[Path], List[Path]]:
     """Parser les logs -efile pour extraire les listes de fichiers.
     
+    Un fichier écrit en plusieurs transactions (une par groupe de stratégie) apparaît
+    une fois par transaction : il n'est retenu que dans une liste, par ordre de priorité
+    erreur > mis à jour > inchangé > condition échouée.
+    
     Args:
         output_dir: Répertoire contenant les logs -efile
         
     Returns:
         Tuple de (error_files, updated_files, unchanged_files, failed_condition_files)
     """
-    error_files = _read_file_list(output_dir / "error_files.txt")
-    updated_files = _read_file_list(output_dir / "updated_files.txt") 
-    unchanged_files = _read_file_list(output_dir / "unchanged_files.txt")
-    failed_condition_files = _read_file_list(output_dir / "failed_condition_files.txt")
+    seen = set()
+    error_files, updated_files, unchanged_files, failed_condition_files = (
+        _unseen(_read_file_list(output_dir / log_file), seen)
+        for log_file in ("error_files.txt", "updated_files.txt",
+                         "unchanged_files.txt", "failed_condition_files.txt")
+    )
     
     logger.info(f"📊 Analyse des logs -efile: {len(error_files)} erreurs, "
                 f"{len(updated_files)} mis à jour, {len(unchanged_files)} inchangés, "
@@ -69,6 +75,16 @@ def build_resume_batch(error_files: List[Path], unchanged_files: List[Path] = No
     return files_to_resume
 
 
+def _unseen(files: List[Path], seen: set) -> List[Path]:
+    """Fichiers de ``files`` absents de ``seen`` (sans doublons, ordre conservé) ; met ``seen`` à jour."""
+    result = []
+    for path in files:
+        if path not in seen:
+            seen.add(path)
+            result.append(path)
+    return result
+
+
 def _read_file_list(log_file: Path) -> List[Path]:
     """Lire une liste de fichiers depuis un log -efile.
     
@@ -5,15 +5,20 @@ from dataclasses import dataclass, field
 from pathlib import Path
 import json
 import logging
+import os
 from typing import List, Optional
 """Analyse des fichiers annexes JSON de Google Takeout."""
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SidecarData:
-    """Métadonnées extraites du sidecar JSON - noms mappés aux champs JSON réels."""
+    """Métadonnées extraites du sidecar JSON - noms mappés aux champs JSON réels.
+
+    ``slots=True`` : accès aux attributs sans ``__dict__`` (chemin chaud de
+    ``build_exiftool_args``). Reste mutable : géocodage et albums sont ajoutés après parsing.
+    """
     
     # Identité du fichier (champ JSON direct)
     title: str
@@ -111,14 +116,14 @@ def parse_sidecar(path: Path) -> SidecarData:
     # Gère plusieurs formats :
     # - [{ "name": "X" }]
     raw_people = data.get("people", []) or []
-    people_name = []
-    for p in raw_people:
-        if isinstance(p, dict):
-            # Format standard : {"name": "X"}
-            if isinstance(p.get("name"), str):
-                people_name.append(p["name"].strip())
-    # déduplication
-    people_name = sorted(set(filter(None, people_name)))
+    # Format standard : {"name": "X"} ; déduplication directement dans un ensemble,
+    # sans liste intermédiaire
+    people_name = {
+        p["name"].strip() for p in raw_people
+        if isinstance(p, dict) and isinstance(p.get("name"), str)
+    }
+    people_name.discard("")
+    people_name = sorted(people_name)
 
 
     def get_ts(key: str) -> Optional[int]:
@@ -206,6 +211,9 @@ def parse_sidecar(path: Path) -> SidecarData:
     )
 
 
+# Extensions des médias dont le sidecar porte le nom (photo.jpg.json)
+_IMAGE_SIDECAR_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".mp4", ".mov", ".avi")
+
 def _is_image_sidecar(json_path: Path) -> bool:
     """Détermine si un fichier JSON est un sidecar d'image plutôt qu'un fichier d'album.
     
@@ -223,9 +231,8 @@ def _is_image_sidecar(json_path: Path) -> bool:
     if name_lower.endswith(".json"):
         # Extraire le nom sans .json
         stem = name_lower[:-5]  # Enlever ".json"
-        # Vérifier si c'est un nom de fichier image
-        image_extensions = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".mp4", ".mov", ".avi"]
-        return any(stem.endswith(ext) for ext in image_extensions)
+        # Vérifier si c'est un nom de fichier image (un seul endswith sur le tuple)
+        return stem.endswith(_IMAGE_SIDECAR_EXTENSIONS)
     
     return False
 
@@ -263,6 +270,20 @@ def parse_album_metadata(path: Path) -> List[str]:
     return []
 
 
+# Fichiers d'album recherchés à chaque niveau (les motifs sont déjà en minuscules)
+_ALBUM_METADATA_PATTERNS = (
+    "metadata.json",
+    "métadonnées.json",
+    "métadonnées(1).json",
+    "métadonnées(2).json",
+    "métadonnées(3).json",
+    "métadonnées(4).json",
+    "métadonnées(5).json",
+)
+
+# Motifs de répertoires marqueurs (insensibles à la casse)
+_TAKEOUT_MARKERS = ("google photos", "takeout", "google takeout")
+
 def find_albums_for_directory(directory: Path, max_depth: int = 5) -> List[str]:
     """Trouver tous les noms d'albums applicables aux photos du répertoire donné.
     
@@ -280,79 +301,64 @@ def find_albums_for_directory(directory: Path, max_depth: int = 5) -> List[str]:
     """
     albums = []
     
-    metadata_patterns = [
-        "metadata.json",
-        "métadonnées.json", 
-        "métadonnées(1).json", 
-        "métadonnées(2).json", 
-        "métadonnées(3).json", 
-        "métadonnées(4).json", 
-        "métadonnées(5).json"
-    ]
-    
     # Rechercher dans le répertoire courant et ses parents avec limite de profondeur
     current_dir = directory
     depth = 0
     
-    # Motifs de répertoires marqueurs (insensibles à la casse)
-    takeout_markers = ["google photos", "takeout", "google takeout"]
-    
     while current_dir != current_dir.parent and depth < max_depth:
-        # Vérifier les motifs standards (insensible à la casse)
-        for pattern in metadata_patterns:
-            # Rechercher le fichier avec la casse exacte d'abord
-            metadata_file = current_dir / pattern
-            if metadata_file.exists():
+        # Une seule lecture du répertoire par niveau (au lieu d'une par motif absent) ;
+        # scandir connaît déjà le type des entrées, sans stat par fichier
+        json_files: list[tuple[str, Path]] = []
+        try:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    name_lower = entry.name.lower()
+                    if name_lower.endswith(".json") and entry.is_file():
+                        json_files.append((name_lower, Path(entry.path)))
+        except (OSError, PermissionError):
+            # Ignorer les erreurs d'accès au répertoire et continuer
+            logger.debug("Impossible d'accéder au répertoire %s", current_dir)
+        # Premier fichier rencontré pour chaque nom (insensible à la casse)
+        by_lower: dict[str, Path] = {}
+        for name_lower, path in json_files:
+            by_lower.setdefault(name_lower, path)
+        exact_names = {path.name for _, path in json_files}
+        
+        # Vérifier les motifs standards (casse exacte d'abord, sinon insensible à la casse)
+        for pattern in _ALBUM_METADATA_PATTERNS:
+            metadata_file = current_dir / pattern if pattern in exact_names else by_lower.get(pattern)
+            if metadata_file is None:
+                continue
+            try:
+                albums.extend(parse_album_metadata(metadata_file))
+            except (OSError, PermissionError) as e:
+                # Ignorer les erreurs de parsing et continuer
+                logger.debug("Erreur lors du parsing de %s: %s", metadata_file, e)
+        
+        # Vérifier les variations numérotées comme métadonnées(1).json, métadonnées(2).json, etc.
+        # ET les autres fichiers contenant metadata/métadonnées (recherche insensible à la casse)
+        for name_lower, metadata_file in json_files:
+            # Variations numérotées de métadonnées
+            if (name_lower.startswith("métadonnées") and 
+                name_lower != "métadonnées.json"):  # déjà vérifié ci-dessus
                 try:
                     albums.extend(parse_album_metadata(metadata_file))
                 except (OSError, PermissionError) as e:
-                    # Ignorer les erreurs de parsing et continuer
-                    logger.debug(f"Erreur lors du parsing de {metadata_file}: {e}")
-            else:
-                # Rechercher de manière insensible à la casse si pas trouvé
+                    logger.debug("Erreur lors du parsing de %s: %s", metadata_file, e)
+            # Autres fichiers contenant metadata (album_metadata.json, folder_metadata.json, etc.)  
+            # MAIS PAS les sidecars d'images
+            elif ("metadata" in name_lower and 
+                  name_lower != "metadata.json" and
+                  not _is_image_sidecar(metadata_file)):  # Exclure les sidecars
                 try:
-                    for existing_file in current_dir.iterdir():
-                        if existing_file.is_file() and existing_file.name.lower() == pattern.lower():
-                            try:
-                                albums.extend(parse_album_metadata(existing_file))
-                            except (OSError, PermissionError) as e:
-                                logger.debug(f"Erreur lors du parsing de {existing_file}: {e}")
-                            break  # Un seul fichier correspondant par motif
-                except (OSError, PermissionError):
-                    # Ignorer les erreurs d'accès au répertoire
-                    logger.debug(f"Impossible d'accéder au répertoire {current_dir}")
-        
-        # Vérifier les variations numérotées comme métadonnées(1).json, métadonnées(2).json, etc.
-        # ET les autres fichiers contenant metadata/métadonnées (recherche insensible à la casse)
-        try:
-            for metadata_file in current_dir.iterdir():
-                if (metadata_file.is_file() and 
-                    metadata_file.name.lower().endswith(".json")):
-                    name_lower = metadata_file.name.lower()
-                    # Variations numérotées de métadonnées
-                    if (name_lower.startswith("métadonnées") and 
-                        name_lower not in ["métadonnées.json"]):  # déjà vérifié ci-dessus
-                        try:
-                            albums.extend(parse_album_metadata(metadata_file))
-                        except (OSError, PermissionError) as e:
-                            logger.debug(f"Erreur lors du parsing de {metadata_file}: {e}")
-                    # Autres fichiers contenant metadata (album_metadata.json, folder_metadata.json, etc.)  
-                    # MAIS PAS les sidecars d'images
-                    elif ("metadata" in name_lower and 
-                          name_lower not in ["metadata.json"] and
-                          not _is_image_sidecar(metadata_file)):  # Exclure les sidecars
-                        try:
-                            albums.extend(parse_album_metadata(metadata_file))
-                        except (OSError, PermissionError) as e:
-                            logger.debug(f"Erreur lors du parsing de {metadata_file}: {e}")
-        except (OSError, PermissionError):
-            # Ignorer les erreurs d'accès au répertoire et continuer
-            logger.debug(f"Impossible d'accéder au répertoire {current_dir}")
+                    albums.extend(parse_album_metadata(metadata_file))
+                except (OSError, PermissionError) as e:
+                    logger.debug("Erreur lors du parsing de %s: %s", metadata_file, e)
         
         # Arrêter si on atteint un répertoire "marqueur" de Google Takeout
         # pour éviter de remonter trop haut dans l'arborescence
-        if any(marker in current_dir.name.lower() for marker in takeout_markers):
-            logger.debug(f"Arrêt de la recherche d'albums au répertoire marqueur: {current_dir}")
+        if any(marker in current_dir.name.lower() for marker in _TAKEOUT_MARKERS):
+            logger.debug("Arrêt de la recherche d'albums au répertoire marqueur: %s", current_dir)
             break
         
         # Remonter au répertoire parent
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Optional
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,9 @@ class ProcessingStats:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     
+    # Les lots exiftool peuvent se terminer dans plusieurs threads (process_directory_batch)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
     def start_processing(self) -> None:
         """Marquer le début du traitement."""
         self.start_time = datetime.now()
@@ -70,32 +74,41 @@ class ProcessingStats:
         Args:
             is_image: True si le fichier est une image, False pour une vidéo.
         """
-        self.total_processed += 1
-        if is_image:
-            self.images_processed += 1
-        else:
-            self.videos_processed += 1
+        with self._lock:
+            self.total_processed += 1
+            if is_image:
+                self.images_processed += 1
+            else:
+                self.videos_processed += 1
     
     def add_failed_file(self, file_path: Path, error_type: str, error_msg: str) -> None:
         """Ajouter un fichier en échec."""
-        self.total_failed += 1
-        self.failed_files.append(f"{file_path.name}: {error_msg}")
-        
-        # Compter les erreurs par type
-        if error_type in self.errors_by_type:
-            self.errors_by_type[error_type] += 1
-        else:
-            self.errors_by_type[error_type] = 1
+        with self._lock:
+            self.total_failed += 1
+            self.failed_files.append(f"{file_path.name}: {error_msg}")
+            
+            # Compter les erreurs par type
+            if error_type in self.errors_by_type:
+                self.errors_by_type[error_type] += 1
+            else:
+                self.errors_by_type[error_type] = 1
     
     def add_skipped_file(self, file_path: Path, reason: str) -> None:
         """Ajouter un fichier ignoré."""
-        self.total_skipped += 1
-        self.skipped_files.append(f"{file_path.name}: {reason}")
+        with self._lock:
+            self.total_skipped += 1
+            self.skipped_files.append(f"{file_path.name}: {reason}")
+    
+    def add_sidecars_cleaned(self, count: int) -> None:
+        """Ajouter des sidecars supprimés ou marqués comme traités."""
+        with self._lock:
+            self.sidecars_cleaned += count
     
     def add_fixed_extension(self, old_name: str, new_name: str) -> None:
         """Ajouter une correction d'extension."""
-        self.files_fixed_extension += 1
-        self.fixed_extensions.append(f"{old_name} → {new_name}")
+        with self._lock:
+            self.files_fixed_extension += 1
+            self.fixed_extensions.append(f"{old_name} → {new_name}")
     
     def print_console_summary(self) -> None:
         """Afficher un résumé concis dans la console."""
@@ -6,6 +6,7 @@ Ce module utilise les coordonnées GPS pour déduire le fuseau horaire exact (DS
 et génère les arguments ExifTool appropriés pour corriger les timestamps.
 """
 
+import functools
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
@@ -23,6 +24,33 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Construit une fois au chargement (et non à chaque appel de _is_video_file)
+_VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.m4v', '.3gp', '.avi', '.mkv'})
+
+def _exif_datetime(dt: datetime) -> str:
+    """Date au format EXIF ``AAAA:MM:JJ HH:MM:SS`` sans passer par strftime (cas usuel)."""
+    if dt.year < 1000:
+        # strftime gère le remplissage des années sur 4 chiffres selon la plateforme
+        return dt.strftime('%Y:%m:%d %H:%M:%S')
+    return f"{dt.year}:{dt.month:02d}:{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+@functools.lru_cache(maxsize=None)
+def _offset_args(offset_string: str) -> tuple[str, str, str]:
+    """Arguments ``-OffsetTime*`` d'un décalage (quelques dizaines au plus pour toute une bibliothèque)."""
+    return (
+        f'-OffsetTimeOriginal={offset_string}',
+        f'-OffsetTimeDigitized={offset_string}',
+        f'-OffsetTime={offset_string}',
+    )
+
+# Copies des dates QuickTime vers les pistes, identiques pour chaque vidéo
+_VIDEO_DATE_COPY_ARGS = (
+    '-TrackCreateDate<QuickTime:CreateDate',
+    '-TrackModifyDate<QuickTime:ModifyDate',
+    '-MediaCreateDate<QuickTime:CreateDate',
+    '-MediaModifyDate<QuickTime:ModifyDate',
+)
+
 @dataclass
 class TimezoneInfo:
     """Information de fuseau horaire calculée"""
@@ -59,7 +87,7 @@ class TimezoneCalculator:
             # Trouver le nom du fuseau horaire
             timezone_name = self.tf.timezone_at(lng=longitude, lat=latitude)
             if not timezone_name:
-                logger.warning(f"Aucun fuseau trouvé pour {latitude}, {longitude}")
+                logger.warning("Aucun fuseau trouvé pour %s, %s", latitude, longitude)
                 return None
             
             # Créer l'objet datetime UTC selon le type d'entrée
@@ -75,7 +103,7 @@ class TimezoneCalculator:
                 tz = ZoneInfo(timezone_name)
                 local_dt = utc_dt.astimezone(tz)
             except Exception as e:
-                logger.error(f"Erreur ZoneInfo pour {timezone_name}: {e}")
+                logger.error("Erreur ZoneInfo pour %s: %s", timezone_name, e)
                 return None
             
             # Calculer l'offset
@@ -100,7 +128,7 @@ class TimezoneCalculator:
             )
             
         except Exception as e:
-            logger.error(f"Erreur calcul timezone pour {latitude}, {longitude}: {e}")
+            logger.error("Erreur calcul timezone pour %s, %s: %s", latitude, longitude, e)
             return None
 
 class TimezoneExifArgsGenerator:
@@ -126,14 +154,15 @@ class TimezoneExifArgsGenerator:
         
         if use_absolute_values:
             # Option A: Valeurs absolues (local time + offset)
-            local_exif = timezone_info.local_datetime.strftime('%Y:%m:%d %H:%M:%S')
+            local_exif = _exif_datetime(timezone_info.local_datetime)
+            offset_original, offset_digitized, offset_time = _offset_args(timezone_info.offset_string)
             
             args.extend([
                 f'-DateTimeOriginal={local_exif}',
-                f'-OffsetTimeOriginal={timezone_info.offset_string}',
+                offset_original,
                 f'-CreateDate={local_exif}',
-                f'-OffsetTimeDigitized={timezone_info.offset_string}',
-                f'-OffsetTime={timezone_info.offset_string}'
+                offset_digitized,
+                offset_time
             ])
         else:
             # Option B: Shift global relatif (si les tags sont déjà en UTC)
@@ -168,16 +197,13 @@ class TimezoneExifArgsGenerator:
             Liste d'arguments ExifTool
         """
         utc_dt = datetime.fromtimestamp(utc_timestamp, tz=timezone.utc)
-        utc_exif = utc_dt.strftime('%Y:%m:%d %H:%M:%S')
+        utc_exif = _exif_datetime(utc_dt)
         
         args = [
             '-api', 'QuickTimeUTC=1',
             f'-QuickTime:CreateDate={utc_exif}',
             f'-QuickTime:ModifyDate={utc_exif}',
-            '-TrackCreateDate<QuickTime:CreateDate',
-            '-TrackModifyDate<QuickTime:ModifyDate', 
-            '-MediaCreateDate<QuickTime:CreateDate',
-            '-MediaModifyDate<QuickTime:ModifyDate',
+            *_VIDEO_DATE_COPY_ARGS,
             '-overwrite_original' if not self._backup_enabled() else '',
             str(file_path)
         ]
@@ -199,7 +225,7 @@ class TimezoneExifArgsGenerator:
             if self._is_video_file(file_path):
                 # Pour les vidéos, on a besoin du timestamp UTC original
                 # Note: Ceci nécessiterait d'être passé séparément 
-                logger.warning(f"Traitement vidéo pas encore implémenté dans args_file pour {file_path}")
+                logger.warning("Traitement vidéo pas encore implémenté dans args_file pour %s", file_path)
                 continue
             else:
                 # Images: valeurs absolues
@@ -211,12 +237,11 @@ class TimezoneExifArgsGenerator:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
         
-        logger.info(f"Fichier d'arguments généré: {output_file}")
+        logger.info("Fichier d'arguments généré: %s", output_file)
     
     def _is_video_file(self, file_path: Path) -> bool:
         """Vérifie si le fichier est une vidéo"""
-        video_extensions = {'.mp4', '.mov', '.m4v', '.3gp', '.avi', '.mkv'}
-        return file_path.suffix.lower() in video_extensions
+        return file_path.suffix.lower() in _VIDEO_EXTENSIONS
     
     def _backup_enabled(self) -> bool:
         """Vérifie si les backups sont activés dans la config"""
@@ -228,7 +253,7 @@ def create_timezone_calculator() -> Optional[TimezoneCalculator]:
     try:
         return TimezoneCalculator()
     except ImportError as e:
-        logger.error(f"Impossible de créer TimezoneCalculator: {e}")
+        logger.error("Impossible de créer TimezoneCalculator: %s", e)
         logger.info("Pour activer le support timezone: pip install timezonefinder")
         return None
 
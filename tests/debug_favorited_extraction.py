@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from google_takeout_metadata.sidecar import SidecarData
 from google_takeout_metadata.config_loader import ConfigLoader
+from google_takeout_metadata.exif_writer import _extract_value_from_meta
 
 def debug_favorited_extraction():
     """Debug de l'extraction des valeurs favorited."""
@@ -35,12 +36,8 @@ def debug_favorited_extraction():
             source_fields = mapping_config.get('source_fields', [])
             print(f"   source_fields: {source_fields}")
             
-            # Simuler l'extraction de valeur
-            value = None
-            for field in source_fields:
-                if hasattr(meta, field):
-                    value = getattr(meta, field)
-                    break
+            # Extraction réelle (table d'extracteurs, champs pointés compris)
+            value = _extract_value_from_meta(meta, source_fields)
                     
             print(f"   Valeur extraite: {value} (type: {type(value)})")
             
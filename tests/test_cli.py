@@ -62,7 +62,7 @@ def test_main_normal_mode(mock_process_directory, tmp_path):
         main([str(tmp_path)])
 
     mock_process_directory.assert_called_once_with(
-        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False
+        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False, workers=1
     )
 
 
@@ -73,7 +73,7 @@ def test_main_batch_mode(mock_process_directory_batch, tmp_path):
         main(["--batch", str(tmp_path)])
 
     mock_process_directory_batch.assert_called_once_with(
-        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False
+        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False, workers=1
     )
 
 
@@ -84,7 +84,7 @@ def test_main_localtime_option(mock_process_directory, tmp_path):
         main(["--localtime", str(tmp_path)])
 
     mock_process_directory.assert_called_once_with(
-        tmp_path, use_localTime=True, immediate_delete=False, organize_files=False, geocode=False
+        tmp_path, use_localTime=True, immediate_delete=False, organize_files=False, geocode=False, workers=1
     )
 
 
@@ -95,7 +95,7 @@ def test_main_overwrite_option(mock_process_directory, tmp_path):
         main(["--overwrite", str(tmp_path)])
 
     mock_process_directory.assert_called_once_with(
-        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False
+        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False, workers=1
     )
 
 
@@ -106,7 +106,7 @@ def test_main_immediate_delete_option(mock_process_directory, tmp_path):
         main(["--immediate-delete", str(tmp_path)])
 
     mock_process_directory.assert_called_once_with(
-        tmp_path, use_localTime=False, immediate_delete=True, organize_files=False, geocode=False
+        tmp_path, use_localTime=False, immediate_delete=True, organize_files=False, geocode=False, workers=1
     )
 
 
@@ -114,13 +114,23 @@ def test_main_immediate_delete_option(mock_process_directory, tmp_path):
 def test_main_batch_with_all_options(mock_process_directory_batch, tmp_path):
     """Tester le mode batch de la CLI avec toutes les options."""
     with patch("shutil.which", return_value="/usr/bin/exiftool"):
-        main(["--batch", "--localtime", "--overwrite", "--immediate-delete", "--geocode", str(tmp_path)])
+        main(["--batch", "--localtime", "--overwrite", "--immediate-delete", "--geocode", "--workers", "4", str(tmp_path)])
 
     mock_process_directory_batch.assert_called_once_with(
-        tmp_path, use_localTime=True, immediate_delete=True, organize_files=False, geocode=True
+        tmp_path, use_localTime=True, immediate_delete=True, organize_files=False, geocode=True, workers=4
     )
 
 
+@patch('google_takeout_metadata.cli.process_directory')
+def test_main_workers_auto(mock_process_directory, tmp_path):
+    """--workers 0 : un exiftool par cœur, au plus 4."""
+    with patch("shutil.which", return_value="/usr/bin/exiftool"), \
+         patch("google_takeout_metadata.exif_writer.os.cpu_count", return_value=16):
+        main(["--workers", "0", str(tmp_path)])
+
+    assert mock_process_directory.call_args.kwargs["workers"] == 4
+
+
 @patch('google_takeout_metadata.cli.process_directory')
 def test_main_geocode_option(mock_process_directory, tmp_path):
     """Tester la CLI avec l'option geocode."""
@@ -128,7 +138,7 @@ def test_main_geocode_option(mock_process_directory, tmp_path):
         main(["--geocode", str(tmp_path)])
 
     mock_process_directory.assert_called_once_with(
-        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=True
+        tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=True, workers=1
     )
 
 
@@ -80,3 +80,52 @@ def test_config_driven_argument_generation():
         if cond_idx + 1 < len(window):
             cond = window[cond_idx + 1]
             assert "Rating" in cond, f"La condition -if devrait viser le tag Rating, mais: {cond}"
+
+
+def test_compile_plan_cached_until_config_reloaded():
+    """Le plan est compilé une fois ; la stratégie modifiée après chargement reste prise en compte."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+
+    plan = config_loader.compile_plan()
+    assert config_loader.compile_plan() is plan
+    description = next(p for p in plan if p.name == "description")
+    assert description.source_fields == ("description",)
+    assert description.target_tags_video == ("XMP-dc:Description",)
+    hierarchical = next(p for p in plan if p.name == "people_hierarchical")
+    assert hierarchical.value_settings == (None, "People|", "person_name", None)
+    favorited = next(p for p in plan if p.name == "favorited")
+    assert favorited.value_mapping == {"true": "5", "false": None}
+
+    config_loader.config['exif_mapping']['description']['default_strategy'] = 'replace_all'
+    meta = SidecarData(title="test.jpg", description="Plage")
+    args = build_exiftool_args(meta, Path("test.jpg"), use_localTime=False, config_loader=config_loader)
+    assert "-MWG:Description=Plage" in args
+    assert not any("MWG:Description" in arg for arg in args if arg != "-MWG:Description=Plage")
+
+    config_loader.set_mapping("description", dict(config_loader.config['exif_mapping']['description'],
+                                                  target_tags_image=["XMP-dc:Description"]))
+    replanned = config_loader.compile_plan()
+    assert replanned is not plan
+    assert next(p for p in replanned if p.name == "description").target_tags_image == ("XMP-dc:Description",)
+    assert config_loader.get_mapping("description").target_tags_image == ["XMP-dc:Description"]
+
+    config_loader.load_config()
+    assert config_loader.compile_plan() is not replanned
+
+
+def test_compile_strategy_cached_per_loaded_config():
+    """Une stratégie est précompilée une fois (groupe, pattern) jusqu'au rechargement."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+
+    strategy = config_loader.compile_strategy('clean_duplicates')
+    assert config_loader.compile_strategy('clean_duplicates') is strategy
+    assert strategy.group == 'patterns'
+    assert strategy.pattern == ('${tag}-=${value}', '${tag}+=${value}')
+    assert config_loader.compile_strategy('preserve_positive_rating').special_logic
+    assert config_loader.compile_strategy('write_if_missing').group == 'conditional'
+    assert config_loader.compile_strategy('inconnue').group == 'unconditional'
+
+    config_loader.load_config()
+    assert config_loader.compile_strategy('clean_duplicates') is not strategy
@@ -3,11 +3,18 @@ from google_takeout_metadata.sidecar import SidecarData
 from google_takeout_metadata.exif_writer import (
     write_metadata, 
     build_exiftool_args,
+    build_exiftool_transactions,
     normalize_person_name,
-    normalize_keyword
+    normalize_keyword,
+    ExifToolDaemon,
+    argfile_line,
 )
 from google_takeout_metadata.config_loader import ConfigLoader
+from google_takeout_metadata import exif_writer
+import os
+import logging
 import subprocess
+import sys
 import pytest
 from pathlib import Path
 
@@ -27,18 +34,154 @@ def test_normalize_keyword():
     assert normalize_keyword("ÉVÉNEMENTS SPÉCIAUX") == "Événements Spéciaux"
     assert normalize_keyword("") == ""
 
+def test_normalize_keyword_ascii_fast_path_matches_unicode_path():
+    """Le raccourci ASCII donne le même résultat ; hors ASCII la première lettre reste en majuscule."""
+    assert normalize_keyword("  beach   PARTY 2019 ") == "Beach Party 2019"
+    assert normalize_keyword("ßtraße") == "SStraße"
+    assert normalize_person_name("ǆenan o'neil") == "Ǆenan O'Neil"
+
 # --- Tests de l'exif_writer ---
 
+FAKE_EXIFTOOL = """#!/usr/bin/env python3
+# Faux exiftool implémentant le protocole -stay_open (-echo4 / -executeN / {readyN})
+import sys
+import time
+log = open(sys.argv[0] + ".log", "a", encoding="utf-8")
+log.write("START " + " ".join(sys.argv[1:]) + "\\n")
+args, prev, echo = [], None, ""
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if prev == "-stay_open" and line == "False":
+        break
+    if prev == "-echo4":
+        echo = line
+    elif line.startswith("-execute"):
+        num = line[len("-execute"):]
+        log.write("CMD " + "|".join(args) + "\\n")
+        log.flush()
+        if any("SLEEP" in a for a in args):
+            time.sleep(30)
+        status = 1 if any("FAIL" in a for a in args) else 0
+        if status:
+            sys.stderr.write("Error: bad\\n")
+        if any("NOISY" in a for a in args):
+            sys.stderr.write("Warning: bruit\\n" * 20000)
+        sys.stdout.write("    1 image files updated\\n{ready" + num + "}\\n")
+        sys.stdout.flush()
+        sys.stderr.write(echo.replace("${status}", str(status)) + "\\n")
+        sys.stderr.flush()
+        args = []
+    elif line not in ("-echo4", "-stay_open"):
+        args.append(line)
+    prev = line
+"""
+
+
+@pytest.fixture
+def fake_exiftool(tmp_path):
+    if sys.platform == "win32":
+        pytest.skip("Script exécutable POSIX requis")
+    script = tmp_path / "exiftool"
+    script.write_text(FAKE_EXIFTOOL, encoding="utf-8")
+    script.chmod(0o755)
+    return script
+
+
 def test_write_metadata_error(tmp_path, monkeypatch):
     meta = SidecarData(title="a.jpg", description="test")
     img = tmp_path / "a.jpg"
     img.write_bytes(b"data")
-    def fake_run(*args, **kwargs):
-        raise subprocess.CalledProcessError(1, "exiftool", stderr="bad")
-    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    class FakeDaemon:
+        def execute_many(self, commands):
+            return [(1, "", "bad") for _ in commands]
+    monkeypatch.setattr(exif_writer, "get_daemon", lambda: FakeDaemon())
     with pytest.raises(RuntimeError):
         write_metadata(img, meta, use_localTime=False)
 
+
+def test_exiftool_daemon_reuses_process(fake_exiftool, tmp_path, caplog):
+    """Le démon -stay_open traite plusieurs fichiers avec un seul processus."""
+    caplog.set_level(logging.INFO, logger=exif_writer.__name__)
+    with ExifToolDaemon(executable=str(fake_exiftool)) as daemon:
+        pid = daemon._process.pid
+        status, out, err = daemon.execute(["-XMP:Rating=5"], tmp_path / "a.jpg")
+        assert status == 0
+        assert out == ""  # stdout non décodé hors mode debug
+        assert err == ""
+        caplog.set_level(logging.DEBUG, logger=exif_writer.__name__)
+        status, out, _ = daemon.execute(["-XMP:Rating=5"], tmp_path / "a.jpg")
+        assert "1 image files updated" in out
+        status, _, err = daemon.execute(["-XMP:Label=FAIL"], tmp_path / "b.jpg")
+        assert status == 1
+        assert "Error: bad" in err
+        assert daemon._process.pid == pid
+    assert not daemon.running
+
+    log = (tmp_path / "exiftool.log").read_text(encoding="utf-8").splitlines()
+    assert sum(line.startswith("START") for line in log) == 1
+    assert "-stay_open True -@ -" in log[0]
+    assert "-common_args" in log[0] and "-api NoDups=1" in log[0]
+    assert log[1] == f"CMD -XMP:Rating=5|{tmp_path / 'a.jpg'}"
+
+
+def test_exiftool_daemon_drains_large_stderr(fake_exiftool, tmp_path):
+    """Des avertissements plus gros que le tampon du pipe ne bloquent pas la lecture de stdout."""
+    with ExifToolDaemon(executable=str(fake_exiftool), timeout=5) as daemon:
+        status, _, err = daemon.execute(["-XMP:Label=NOISY"], tmp_path / "a.jpg")
+        assert status == 0
+        assert err.count("Warning: bruit") == 20000
+        assert daemon.execute(["-XMP:Rating=5"], tmp_path / "a.jpg")[0] == 0
+
+
+def test_exiftool_daemon_timeout_kills_process(fake_exiftool, tmp_path):
+    """Une commande bloquée dépasse son échéance : le processus est tué et le démon relancé ensuite."""
+    daemon = ExifToolDaemon(executable=str(fake_exiftool), timeout=0.5)
+    try:
+        with pytest.raises(subprocess.TimeoutExpired):
+            daemon.execute(["-XMP:Label=SLEEP"], tmp_path / "a.jpg")
+        assert not daemon.running
+        status, _, _ = daemon.execute(["-XMP:Rating=5"], tmp_path / "b.jpg")
+        assert status == 0
+    finally:
+        daemon.close()
+
+
+def test_write_metadata_uses_given_daemon(fake_exiftool, tmp_path, monkeypatch):
+    """Un démon fourni par l'appelant est partagé entre fichiers, sans démon global."""
+    monkeypatch.setattr(exif_writer, "get_daemon", lambda: pytest.fail("démon global inattendu"))
+    with ExifToolDaemon(executable=str(fake_exiftool)) as daemon:
+        for name in ("a.jpg", "b.jpg"):
+            write_metadata(tmp_path / name, SidecarData(title=name, description="Plage"), daemon=daemon)
+    log = (tmp_path / "exiftool.log").read_text(encoding="utf-8").splitlines()
+    assert sum(line.startswith("START") for line in log) == 1
+    assert any(str(tmp_path / "b.jpg") in line for line in log)
+
+
+def test_write_metadata_sends_strategy_groups_in_one_round_trip(fake_exiftool, tmp_path, monkeypatch):
+    """Les groupes de stratégies restent des transactions distinctes d'un même envoi."""
+    daemon = ExifToolDaemon(executable=str(fake_exiftool))
+    monkeypatch.setattr(exif_writer, "get_daemon", lambda: daemon)
+    sent = []
+    execute_many = daemon.execute_many
+    monkeypatch.setattr(daemon, "execute_many", lambda commands: sent.append(commands) or execute_many(commands))
+
+    img = tmp_path / "a.jpg"
+    img.write_bytes(b"data")
+    meta = SidecarData(title="a.jpg", description="Plage", people_name=["Alice"], favorited=True)
+    try:
+        write_metadata(img, meta)
+    finally:
+        daemon.close()
+
+    assert len(sent) == 1
+    assert len(sent[0]) >= 3  # conditionnel, patterns, logique spéciale
+    log = (tmp_path / "exiftool.log").read_text(encoding="utf-8").splitlines()
+    assert sum(line.startswith("CMD") for line in log) == len(sent[0])
+    for args, _ in sent[0]:
+        assert (args[0] == "-fast2") == ("-if" in args)
+        assert "-fast" not in args
+
 def test_build_args_current_api():
     """Teste la fonction build_exiftool_args() avec l'API config-driven actuelle."""
     meta = SidecarData(
@@ -114,3 +257,454 @@ def test_build_args_video_vs_image():
 
 
 # === Tests de fonctions utilitaires ===
+
+def test_simple_meta_fast_path():
+    """Un sidecar description + dates ne produit que les tags correspondants."""
+    meta = SidecarData(title="test.jpg", description="Plage", photoTakenTime_timestamp=1736719606)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    args = build_exiftool_args(meta, Path("test.jpg"), False, config_loader)
+    assert "-MWG:Description=Plage" in args
+    assert "-EXIF:DateTimeOriginal=2025:01:12 22:06:46" in args
+    assert not any("PersonInImage" in arg or "Rating" in arg or "GPS" in arg for arg in args)
+
+
+def test_argfile_line_escapes_newlines():
+    """Une valeur multi-ligne reste un seul argument dans le fichier d'arguments."""
+    assert argfile_line("-XMP-dc:Title=Plage") == "-XMP-dc:Title=Plage"
+    assert argfile_line("-XMP-dc:Title=Ligne 1\nLigne\\2") == "#[CSTR]-XMP-dc:Title=Ligne 1\\nLigne\\\\2"
+
+
+def test_exiftool_pool_map_lends_a_free_daemon_per_call(fake_exiftool, tmp_path, monkeypatch):
+    """Chaque appel de ``map`` reçoit un démon libre du pool ; les démons sont arrêtés à la fermeture."""
+    monkeypatch.setattr(exif_writer, "ExifToolDaemon",
+                        lambda executable="exiftool": ExifToolDaemon(executable=str(fake_exiftool)))
+    images = []
+    for i in range(4):
+        img = tmp_path / f"{i}.jpg"
+        img.write_bytes(b"data")
+        images.append(img)
+
+    with exif_writer.ExifToolPool(2) as pool:
+        pool.warm_up()
+        results = list(pool.map(lambda img, daemon: daemon.execute([f"-XMP-dc:Title={img.name}"], img), images))
+        daemons = list(pool._daemons)
+
+    assert [status for status, _, _ in results] == [0] * 4
+    assert not any(daemon.running for daemon in daemons)
+    log = (tmp_path / "exiftool.log").read_text(encoding="utf-8").splitlines()
+    assert sum(line.startswith("START") for line in log) == 2
+    assert sum(line.startswith("CMD") for line in log) == 4
+
+
+def test_exiftool_pool_default_size_matches_cli(monkeypatch):
+    """Sans taille, le pool suit le même défaut que ``--workers 0`` (au plus 4 démons)."""
+    monkeypatch.setattr(exif_writer.os, "cpu_count", lambda: 16)
+    pool = exif_writer.ExifToolPool()
+    assert pool.size == exif_writer._default_workers() == 4
+    pool.close()
+
+
+def test_gps_values_use_fixed_point():
+    """Les coordonnées proches de zéro ne passent pas en notation scientifique."""
+    meta = SidecarData(title="test.jpg", geoData_latitude=0.00001, geoData_longitude=2.3522, geoData_altitude=35.0)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    args = build_exiftool_args(meta, Path("test.jpg"), False, config_loader)
+    assert "-GPSPosition=0.0000100, 2.3522000" in args
+    assert "-GPSAltitude=35.000" in args
+    assert not any("e-05" in arg for arg in args)
+    video_args = build_exiftool_args(meta, Path("test.mp4"), False, config_loader)
+    assert "-XMP-exif:GPSLatitude=0.0000100" in video_args
+    assert "-XMP-exif:GPSAltitude=35.000" in video_args
+
+
+def test_gps_position_written_as_single_signed_tag():
+    """Images : un seul tag composite GPSPosition (références déduites du signe) ; vidéos : XMP."""
+    meta = SidecarData(title="test.jpg", geoData_latitude=-33.8688, geoData_longitude=151.2093)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    args = build_exiftool_args(meta, Path("test.jpg"), False, config_loader)
+    assert "-GPSPosition=-33.8688000, 151.2093000" in args
+    assert not any(arg.startswith(("-GPSLatitude", "-GPSLongitude")) for arg in args)
+
+    video_args = build_exiftool_args(meta, Path("test.mp4"), False, config_loader)
+    assert "-XMP-exif:GPSLatitude=-33.8688000" in video_args
+    assert not any("GPSPosition" in arg for arg in video_args)
+
+
+def test_list_values_deduplicated_after_normalization():
+    """Deux noms identiques après normalisation ne produisent qu'une paire -=/+=."""
+    meta = SidecarData(title="test.jpg", people_name=["alice martin", "Alice Martin", "Bob"])
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    args = build_exiftool_args(meta, Path("test.jpg"), False, config_loader)
+    assert args.count("-XMP-iptcExt:PersonInImage+=Alice Martin") == 1
+    person_args = [arg for arg in args if arg.startswith("-XMP-iptcExt:PersonInImage+=")]
+    assert person_args == ["-XMP-iptcExt:PersonInImage+=Alice Martin", "-XMP-iptcExt:PersonInImage+=Bob"]
+
+
+def test_sanitize_description_replaces_line_breaks():
+    """Les retours à la ligne deviennent des espaces, les bords sont nettoyés."""
+    assert exif_writer._sanitize_description("  Plage\r\nde Nice\n") == "Plage  de Nice"
+    assert exif_writer._sanitize_description("Sans retour") == "Sans retour"
+
+
+def test_write_metadata_skips_empty_sidecar(monkeypatch):
+    """Sidecar sans aucun champ mappé (favori à False ignoré par value_mapping) : démon non sollicité."""
+    def fail(*_args, **_kwargs):
+        raise AssertionError("exiftool ne doit pas être appelé")
+    monkeypatch.setattr(exif_writer, "get_daemon", fail)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    write_metadata(Path("vide.jpg"), SidecarData(title=""), config_loader=config_loader)
+
+
+def test_false_value_reaches_value_mapping():
+    """``favorited=False`` est une valeur : un value_mapping "false" explicite est écrit."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    config_loader.set_mapping('favorited_flag', {
+        'source_fields': ['favorited'], 'target_tags_image': ['XMP-xmp:Label'],
+        'target_tags_video': [], 'default_strategy': 'replace_all',
+        'value_mapping': {'true': 'Favori', 'false': 'Standard'},
+    })
+    args = build_exiftool_args(SidecarData(title="a.jpg", favorited=False), Path("a.jpg"), False, config_loader)
+    assert "-XMP-xmp:Label=Standard" in args
+    assert not any("Rating" in arg for arg in args)
+
+
+def test_build_exiftool_transactions_isolates_conditions():
+    """Les arguments -if restent dans leur transaction, séparés des écritures inconditionnelles."""
+    meta = SidecarData(title="test.mp4", description="Plage", photoTakenTime_timestamp=1700000000)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    transactions = build_exiftool_transactions(meta, Path("test.mp4"), False, config_loader)
+    assert len(transactions) >= 2
+    for transaction in transactions:
+        assert transaction[:2] == ["-charset", "filename=utf8"]
+        assert "QuickTimeUTC=1" in transaction
+    # Vidéo : pas de -fast2 (lecture arrêtée à l'atome mdat), même pour les conditions
+    assert not any(arg.startswith("-fast") for t in transactions for arg in t)
+    unconditional = [t for t in transactions if "-if" not in t]
+    assert any(arg.startswith("-QuickTime:CreateDate=") for t in unconditional for arg in t)
+    # Mode par lots : les options communes sont passées une seule fois par l'appelant
+    batch_transactions = build_exiftool_transactions(meta, Path("test.mp4"), False, config_loader,
+                                                     include_common_args=False)
+    assert batch_transactions == [t[7:] for t in transactions]
+
+
+def test_strategy_transactions_merge_unconditional_groups():
+    """unconditional et patterns partagent une transaction ; chaque groupe à -if garde la sienne."""
+    groups = {
+        'conditional': ["-if", "not $XMP-dc:Title", "-XMP-dc:Title=a"],
+        'unconditional': ["-XMP:Rating=1"],
+        'patterns': ["-XMP-dc:Subject-=b", "-XMP-dc:Subject+=b"],
+        'special_logic': [],
+    }
+    assert exif_writer._strategy_transactions(groups, fast2=True) == [
+        ["-fast2", "-if", "not $XMP-dc:Title", "-XMP-dc:Title=a"],
+        ["-XMP:Rating=1", "-XMP-dc:Subject-=b", "-XMP-dc:Subject+=b"],
+    ]
+    assert exif_writer._strategy_transactions(groups, fast2=False) == [
+        ["-if", "not $XMP-dc:Title", "-XMP-dc:Title=a"],
+        ["-XMP:Rating=1", "-XMP-dc:Subject-=b", "-XMP-dc:Subject+=b"],
+    ]
+
+
+def test_fast2_only_for_formats_with_leading_metadata():
+    """-fast2 pour JPEG/TIFF/HEIC ; jamais pour PNG (XMP/eXIf possibles après IDAT) ni vidéos."""
+    meta = SidecarData(title="a", description="Plage")
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    for name, expected in [("a.jpg", True), ("a.HEIC", True), ("a.tif", True), ("a.png", False), ("a.mp4", False)]:
+        transactions = build_exiftool_transactions(meta, Path(name), False, config_loader)
+        assert any("-if" in t for t in transactions)
+        assert all(("-fast2" in t) == (expected and "-if" in t) for t in transactions), name
+
+
+def test_strategy_transactions_fuse_conditions():
+    """Les -if d'une transaction (combinés en ET par exiftool) forment une seule expression."""
+    groups = {
+        'conditional': ["-if", "not $XMP-dc:Title", "-XMP-dc:Title=a",
+                        "-if", "not $IPTC:City", "-IPTC:City=Paris",
+                        "-if", "not $XMP-dc:Title", "-XMP-dc:Title=b"],
+        'special_logic': ["-if", "not defined $Rating", "-XMP:Rating=5"],
+    }
+    assert exif_writer._strategy_transactions(groups, fast2=True) == [
+        ["-fast2", "-if", "(not $XMP-dc:Title) and (not $IPTC:City)",
+         "-XMP-dc:Title=a", "-IPTC:City=Paris", "-XMP-dc:Title=b"],
+        ["-fast2", "-if", "not defined $Rating", "-XMP:Rating=5"],
+    ]
+
+
+def test_strategy_transactions_skip_condition_only_groups():
+    """Un groupe réduit à des conditions -if (liste vide, par exemple) ne lance aucune commande."""
+    groups = {
+        'conditional': ["-if", "not defined $XMP-dc:Subject"],
+        'unconditional': [],
+        'special_logic': ["-if", "$XMP:Rating eq '0'", "-XMP:Rating=5"],
+    }
+    assert exif_writer._strategy_transactions(groups, fast2=True) == [
+        ["-fast2", "-if", "$XMP:Rating eq '0'", "-XMP:Rating=5"],
+    ]
+    groups['special_logic'] = []
+    assert exif_writer._strategy_transactions(groups, fast2=True) == []
+
+
+def test_extract_value_from_meta_dispatch():
+    """Chaque champ source est résolu par la table d'extracteurs ; champ inconnu ou vide → None."""
+    meta = SidecarData(title="a.jpg", geoData_latitude=-12.5, people_name=[], favorited=False)
+    assert exif_writer._extract_value_from_meta(meta, ["geoData.latitude.ref"]) == "negative"
+    assert exif_writer._extract_value_from_meta(meta, ["geoData.latitude"]) == -12.5
+    assert exif_writer._extract_value_from_meta(meta, ["people.name", "title"]) == "a.jpg"
+    assert exif_writer._extract_value_from_meta(meta, ["favorited"]) is False
+    assert exif_writer._extract_value_from_meta(meta, ["inconnu", "city"]) is None
+    meta.geoData_longitude = 2.5
+    assert exif_writer._extract_value_from_meta(meta, ("geoData.longitude", "geoData.latitude")) == "-12.5000000, 2.5000000"
+
+
+def test_format_timestamp_value_utc_before_epoch():
+    """Les timestamps UTC négatifs (avant 1970) sont formatés sur toutes les plateformes."""
+    template = "%Y:%m:%d %H:%M:%S"
+    assert exif_writer._format_timestamp_value(1640995200, template) == "2022:01:01 00:00:00"
+    assert exif_writer._format_timestamp_value(-86400, template) == "1969:12:31 00:00:00"
+    assert exif_writer._format_timestamp_value(1640995200, "%Y:%m:%d %H:%M:%S%z") == "2022:01:01 00:00:00+0000"
+
+
+def test_repeated_tag_args_share_one_string():
+    """Un même argument produit pour deux fichiers est un seul objet chaîne ; patterns inchangés."""
+    first = exif_writer._build_simple_tag_args("XMP-dc:Subject", ["Vacances"])[0]
+    second = exif_writer._build_simple_tag_args("XMP-dc:Subject", ["Vacances"])[0]
+    assert first == "-XMP-dc:Subject=Vacances"
+    assert first is second
+    assert exif_writer._build_pattern_args(["${tag}-=${value}", "${tag}+=${value}"], "XMP:Subject", ["A", "B"]) == [
+        "-XMP:Subject-=A", "-XMP:Subject+=A", "-XMP:Subject-=B", "-XMP:Subject+=B"]
+    assert exif_writer._build_pattern_args(("-${tag}=${value}",), "XMP:Rating", 5) == ["-XMP:Rating=5"]
+
+
+def test_group_args_classified_by_strategy_not_values():
+    """Une valeur contenant "-if" ne fait pas passer un album dans le groupe conditionnel."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    meta = SidecarData(title="a.jpg", albums=["Sous-ifs"])
+    groups = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)
+    assert "-XMP-dc:Subject+=Album: Sous-ifs" in groups["patterns"]
+    assert not any("Sous-ifs" in arg for arg in groups["conditional"])
+
+
+def test_merge_timezone_args_replaces_only_date_tags():
+    """Les arguments de date de base sont remplacés par ceux de la correction timezone."""
+    base = [
+        "-XMP-exif:DateTimeOriginal=2020:01:01 10:00:00",
+        "-if", "not $XMP-exif:DateTimeOriginal",
+        "-EXIF:ImageDescription=CreateDate",
+        "-QuickTime:CreateDate-=x",
+    ]
+    tz = ["-EXIF:DateTimeOriginal=2020:01:01 11:00:00"]
+    assert exif_writer._merge_timezone_args(base, tz) == [
+        "-if", "not $XMP-exif:DateTimeOriginal",
+        "-EXIF:ImageDescription=CreateDate",
+        *tz,
+    ]
+
+
+def test_is_tz_date_arg_linear_on_long_arguments():
+    """Seul le nom de tag compte ; un argument de 500 mots-clés sans '=' est rejeté rapidement."""
+    keywords = "-" + ",".join(["CreateDate"] * 500)
+    assert not exif_writer._is_tz_date_arg(keywords)
+    assert not exif_writer._is_tz_date_arg("-XMP-dc:Subject+=" + keywords)
+    assert exif_writer._is_tz_date_arg("-QuickTime:CreateDate=2020:01:01 10:00:00")
+
+
+def test_value_transform_composes_processing_and_normalization():
+    """Aucune fonction pour un mapping sans traitement ; préfixe puis normalisation sinon."""
+    assert exif_writer._value_transform('', None, None) is None
+    transform = exif_writer._value_transform('Album: ', 'keyword', None)
+    assert transform(["vacances"]) == [exif_writer.normalize_keyword("Album: vacances")]
+    assert exif_writer._value_transform('', None, 'person_name')(["jean dupont"]) == ["Jean Dupont"]
+    assert exif_writer._value_transform('', 'keyword', None)("paris") == "Paris"
+    # Traitement et normalisation directe combinés dans la même chaîne mémorisée
+    both = exif_writer._value_transform('People|', None, 'keyword')
+    assert both(["jean", "jean"]) == ["People|jean"] * 2
+    assert both("jean") == "People|jean"
+    # Sans préfixe, les deux normalisations restent appliquées
+    assert exif_writer._value_transform('', 'keyword', 'person_name')("jean de la fontaine") == \
+        exif_writer.normalize_person_name("Jean De La Fontaine")
+
+
+def test_shared_source_fields_extracted_once(monkeypatch):
+    """Les mappings albums et albums_hierarchical partagent une seule extraction."""
+    calls = []
+    original = exif_writer._extract_value_from_meta
+
+    def counting(meta, source_fields):
+        calls.append(tuple(source_fields))
+        return original(meta, source_fields)
+
+    monkeypatch.setattr(exif_writer, "_extract_value_from_meta", counting)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    meta = SidecarData(title="a.jpg", albums=["Vacances"])
+    exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)
+    assert calls.count(("albums",)) == 1
+
+
+def test_populated_source_fields():
+    """Seuls les champs renseignés sont retenus ; 0 et False sont des valeurs, "" et [] non."""
+    from google_takeout_metadata.exif_writer import _populated_source_fields
+    meta = SidecarData(title="a.jpg", photoTakenTime_timestamp=0, geoData_latitude=0.0,
+                       favorited=False, description="", albums=[])
+    fields = _populated_source_fields(meta)
+    assert {"title", "photoTakenTime.timestamp", "geoData.latitude", "geoData.latitude.ref", "favorited"} <= fields
+    assert not fields & {"people", "albums", "description", "geoData.longitude"}
+
+
+def test_identical_tag_blocks_deduplicated():
+    """Deux mappings écrivant le même tag avec la même valeur ne produisent qu'un bloc."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    keywords = {
+        'source_fields': ['city'], 'target_tags_image': ['IPTC:Keywords'],
+        'target_tags_video': [], 'default_strategy': 'write_if_missing',
+    }
+    config_loader.set_mapping('keywords_a', keywords)
+    config_loader.set_mapping('keywords_b', dict(keywords))
+    meta = SidecarData(title="a.jpg", city="Paris")
+    groups = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)
+    assert groups["conditional"] == [
+        "-if", "not $IPTC:ObjectName", "-IPTC:ObjectName=a.jpg",
+        "-if", "not $XMP-dc:Title", "-XMP-dc:Title=a.jpg",
+        "-if", "not $XMP-photoshop:City", "-XMP-photoshop:City=Paris",
+        "-if", "not $IPTC:City", "-IPTC:City=Paris",
+        "-if", "not $IPTC:Keywords", "-IPTC:Keywords=Paris",
+    ]
+
+
+def test_argfile_path_keeps_filesystem_bytes():
+    """Les chemins partent en octets du système de fichiers, échappés comme argfile_line."""
+    from google_takeout_metadata.exif_writer import _argfile_path
+    assert _argfile_path(Path("/photos/Été.jpg")) == "/photos/Été.jpg".encode("utf-8")
+    # Nom non UTF-8 (octet isolé décodé en surrogate par le système) : restitué tel quel
+    assert _argfile_path(Path(os.fsdecode(b"/photos/\xe9t\xe9.jpg"))) == b"/photos/\xe9t\xe9.jpg"
+    assert _argfile_path(Path("/photos/a\nb.jpg")) == b"#[CSTR]/photos/a\\nb.jpg"
+
+
+def test_daemon_warm_up_is_best_effort(fake_exiftool, tmp_path):
+    """warm_up lance le processus une seule fois et ignore un exécutable introuvable."""
+    missing = exif_writer.ExifToolDaemon(executable=str(tmp_path / "absent"))
+    missing.warm_up()
+    assert not missing.running
+
+    with ExifToolDaemon(executable=str(fake_exiftool)) as daemon:
+        process = daemon._process
+        daemon.warm_up()
+        assert daemon._process is process
+
+
+def test_people_names_prepared_once_per_file(monkeypatch):
+    """PersonInImage et IPTC:Keywords réutilisent la même liste de noms normalisés."""
+    calls = []
+    original = exif_writer._prepare_value
+
+    def counting(value, value_key, use_localTime=False):
+        calls.append(value_key)
+        return original(value, value_key, use_localTime)
+
+    monkeypatch.setattr(exif_writer, "_prepare_value", counting)
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    meta = SidecarData(title="a.jpg", people_name=["jean dupont"])
+    groups = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)
+    assert "-XMP-iptcExt:PersonInImage+=Jean Dupont" in groups["patterns"]
+    assert "-IPTC:Keywords+=Jean Dupont" in groups["patterns"]
+    # people_name et people_keywords : une préparation ; people_hierarchical (préfixe) : une autre
+    assert len([key for key in calls if key[1] is not None]) == 2
+
+
+def test_append_only_strategy_emits_single_add_per_unique_value():
+    """append_only : un seul += par valeur unique, sans le -= de clean_duplicates."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    config_loader.config['exif_mapping']['people_keywords']['default_strategy'] = 'append_only'
+    meta = SidecarData(title="a.jpg", people_name=["Jean Dupont", "jean dupont", "Marie"])
+    groups = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)
+    keywords = [arg for arg in groups["patterns"] if arg.startswith("-IPTC:Keywords")]
+    assert keywords == ["-IPTC:Keywords+=Jean Dupont", "-IPTC:Keywords+=Marie"]
+
+
+def test_people_emitted_once_per_target_tag():
+    """Un nom répété (casse différente) n'est écrit qu'une fois par tag, image comme vidéo."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    meta = SidecarData(title="a.jpg", people_name=["jean dupont", "Jean Dupont"])
+    for path, keywords_tag in (("a.jpg", "IPTC:Keywords"), ("a.mp4", "XMP-dc:Subject")):
+        args = build_exiftool_args(meta, Path(path), False, config_loader)
+        for tag in ("XMP-iptcExt:PersonInImage", keywords_tag):
+            assert args.count(f"-{tag}-=Jean Dupont") == 1
+            assert args.count(f"-{tag}+=Jean Dupont") == 1
+
+
+def _albums_as_keywords(config_loader):
+    """Mapping d'albums écrits dans IPTC:Keywords, comme les personnes (valeurs qui se recoupent)."""
+    config_loader.set_mapping('albums_as_keywords', {
+        'source_fields': ['albums'],
+        'target_tags_image': ['IPTC:Keywords'],
+        'default_strategy': 'clean_duplicates',
+        'normalize': 'person_name',
+    })
+
+
+def test_list_ops_shared_between_mappings_emitted_once():
+    """Un album homonyme d'une personne, écrit dans le même tag, ne répète pas la paire -=/+=."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    _albums_as_keywords(config_loader)
+    meta = SidecarData(title="a.jpg", people_name=["jean dupont", "marie"], albums=["Jean Dupont", "Plage"])
+    patterns = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)["patterns"]
+    assert patterns == [
+        "-XMP-iptcExt:PersonInImage-=Jean Dupont", "-XMP-iptcExt:PersonInImage+=Jean Dupont",
+        "-XMP-iptcExt:PersonInImage-=Marie", "-XMP-iptcExt:PersonInImage+=Marie",
+        "-XMP-lr:HierarchicalSubject-=People|jean Dupont", "-XMP-lr:HierarchicalSubject+=People|jean Dupont",
+        "-XMP-lr:HierarchicalSubject-=People|marie", "-XMP-lr:HierarchicalSubject+=People|marie",
+        "-IPTC:Keywords-=Jean Dupont", "-IPTC:Keywords+=Jean Dupont",
+        "-IPTC:Keywords-=Marie", "-IPTC:Keywords+=Marie",
+        "-XMP-dc:Subject-=Album: Jean Dupont", "-XMP-dc:Subject+=Album: Jean Dupont",
+        "-XMP-dc:Subject-=Album: Plage", "-XMP-dc:Subject+=Album: Plage",
+        "-XMP-lr:HierarchicalSubject-=Albums|jean Dupont", "-XMP-lr:HierarchicalSubject+=Albums|jean Dupont",
+        "-XMP-lr:HierarchicalSubject-=Albums|plage", "-XMP-lr:HierarchicalSubject+=Albums|plage",
+        # La paire Jean Dupont des albums est déjà émise par les personnes
+        "-IPTC:Keywords-=Plage", "-IPTC:Keywords+=Plage",
+    ]
+
+
+def test_list_op_pair_kept_whole_after_single_add():
+    """Un += seul (append_only) ne fait pas tomber le += d'une paire -=/+= ultérieure."""
+    config_loader = ConfigLoader()
+    config_loader.load_config()
+    config_loader.config['exif_mapping']['people_keywords']['default_strategy'] = 'append_only'
+    _albums_as_keywords(config_loader)
+    meta = SidecarData(title="a.jpg", people_name=["jean dupont"], albums=["Jean Dupont"])
+    patterns = exif_writer._group_args_by_strategy(meta, Path("a.jpg"), False, config_loader)["patterns"]
+    assert [arg for arg in patterns if arg.startswith("-IPTC:Keywords")] == [
+        "-IPTC:Keywords+=Jean Dupont",
+        "-IPTC:Keywords-=Jean Dupont", "-IPTC:Keywords+=Jean Dupont",
+    ]
+
+
+def test_dedup_units_pair_list_ops():
+    """Seule une paire -=/+= sur le même tag et la même valeur forme une unité."""
+    args = ("-K-=a", "-K+=a", "-K+=b", "-K-=c", "-L+=c", "-T=x")
+    assert list(exif_writer._dedup_units(args)) == [
+        ("-K-=a", "-K+=a"), ("-K+=b",), ("-K-=c",), ("-L+=c",), ("-T=x",),
+    ]
+
+
+def test_clear_caches_empties_module_caches():
+    """clear_caches vide les caches de module ; celui des transformations est borné."""
+    exif_writer.normalize_keyword("plage")
+    exif_writer._value_transform("Albums|", "keyword", None)
+    exif_writer.clear_caches()
+    assert exif_writer.normalize_keyword.cache_info().currsize == 0
+    assert exif_writer._value_transform.cache_info().currsize == 0
+    assert exif_writer._value_transform.cache_info().maxsize is not None
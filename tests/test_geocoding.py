@@ -79,3 +79,29 @@ def test_reverse_geocode_uses_cache(monkeypatch, tmp_path):
     geocoding.reverse_geocode(1.0, 2.0)
     assert call_count == 1
 
+
+
+def test_reverse_geocode_keeps_entries_saved_by_other_threads(monkeypatch, tmp_path):
+    """Le cache est relu avant d'être réécrit : les entrées ajoutées entre-temps sont conservées."""
+
+    cache_file = tmp_path / "cache.json"
+    monkeypatch.setenv("GOOGLE_TAKEOUT_METADATA_CACHE", str(cache_file))
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "dummy")
+
+    class FakeResp:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"status": "OK", "results": [1]}
+
+    def fake_get(url, params, timeout):
+        # Un autre thread enregistre ses coordonnées pendant la requête
+        geocoding._save_cache({"3.0,4.0": [2]})
+        return FakeResp()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    geocoding.reverse_geocode(1.0, 2.0)
+
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {"3.0,4.0": [2], "1.0,2.0": [1]}
+    assert list(tmp_path.iterdir()) == [cache_file]
@@ -4,6 +4,8 @@ import unittest.mock
 import os
 from google_takeout_metadata.processor import (
     process_directory, 
+    process_sidecar_file,
+    detect_file_type,
     _is_sidecar_file, 
     fix_file_extension_mismatch
 )
@@ -45,6 +47,17 @@ def test_is_sidecar_file_negative() -> None:
     assert not _is_sidecar_file(Path("métadonnées.json"))  # album metadata, pas un sidecar
 
 
+def test_detect_file_type_ignores_file_name(tmp_path: Path) -> None:
+    """La sortie de ``file`` est lue en octets, sans le nom du fichier (ici trompeur)."""
+    media_path = tmp_path / "photo.jpeg"
+    media_path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    completed = unittest.mock.Mock(returncode=0, stdout=b"PNG image data, 1 x 1\n")
+    with unittest.mock.patch("google_takeout_metadata.processor.subprocess.run", return_value=completed) as mock_run:
+        assert detect_file_type(media_path) == ".png"
+    assert mock_run.call_args.args[0] == ["file", "-b", str(media_path)]
+    assert "text" not in mock_run.call_args.kwargs
+
+
 def test_fix_file_extension_mismatch_rollback_on_failure(tmp_path: Path) -> None:
     """Vérifier que fix_file_extension_mismatch annule correctement le renommage de l'image en cas d'échec"""
     # Créer un faux fichier JPEG avec une mauvaise extension
@@ -110,3 +123,57 @@ def test_fix_file_extension_mismatch_failed_rollback(tmp_path: Path) -> None:
         assert result_json == json_path  # Chemin JSON d'origine
         assert (tmp_path / "photo.jpg").exists()  # La nouvelle image devrait exister
         assert not media_path.exists()  # L'image originale ne devrait pas exister
+
+
+def test_process_sidecar_file_uses_given_daemon(tmp_path: Path) -> None:
+    """Le démon fourni (ex: un par thread) est transmis à write_metadata."""
+    (tmp_path / "a.jpg").write_bytes(b"")
+    json_path = tmp_path / "a.jpg.json"
+    json_path.write_text(json.dumps({"title": "a.jpg", "description": "x"}), encoding="utf-8")
+    daemon = object()
+    with unittest.mock.patch("google_takeout_metadata.processor.write_metadata") as mock_write:
+        process_sidecar_file(json_path, daemon=daemon)
+    assert mock_write.call_args.kwargs["daemon"] is daemon
+
+
+def test_process_directory_parallel_uses_one_daemon_per_worker(tmp_path: Path) -> None:
+    """Avec workers > 1, chaque fichier est écrit dans un thread du pool avec un démon libre."""
+    for i in range(4):
+        (tmp_path / f"p{i}.jpg").write_bytes(b"")
+        (tmp_path / f"p{i}.jpg.json").write_text(json.dumps({"title": f"p{i}.jpg"}), encoding="utf-8")
+    seen = []
+
+    def fake_process(json_file, **kwargs):
+        import threading
+        seen.append((threading.current_thread().name, kwargs["daemon"]))
+
+    with unittest.mock.patch("google_takeout_metadata.exif_writer.ExifToolDaemon") as mock_daemon_cls, \
+         unittest.mock.patch("google_takeout_metadata.processor.process_sidecar_file", side_effect=fake_process):
+        mock_daemon_cls.side_effect = lambda **kwargs: unittest.mock.MagicMock()
+        process_directory(tmp_path, workers=2)
+
+    assert mock_daemon_cls.call_count == 2
+    assert len(seen) == 4
+    
+    # Plus de workers que de fichiers : un démon par fichier seulement
+    with unittest.mock.patch("google_takeout_metadata.exif_writer.ExifToolDaemon") as mock_daemon_cls, \
+         unittest.mock.patch("google_takeout_metadata.processor.process_sidecar_file", side_effect=fake_process):
+        mock_daemon_cls.side_effect = lambda **kwargs: unittest.mock.MagicMock()
+        process_directory(tmp_path, workers=8)
+    assert mock_daemon_cls.call_count == 4
+    assert all(name.startswith("exiftool") for name, _ in seen)
+    assert all(daemon is not None for _, daemon in seen)
+
+
+def test_process_directory_looks_up_albums_once_per_directory(tmp_path: Path) -> None:
+    """Les sidecars d'un même dossier partagent une seule recherche d'albums."""
+    for i in range(3):
+        (tmp_path / f"r{i}.jpg").write_bytes(b"")
+        (tmp_path / f"r{i}.jpg.json").write_text(json.dumps({"title": f"r{i}.jpg", "description": "x"}), encoding="utf-8")
+    written = []
+    with unittest.mock.patch("google_takeout_metadata.processor.find_albums_for_directory", return_value=["Vacances"]) as mock_find, \
+         unittest.mock.patch("google_takeout_metadata.processor.write_metadata", side_effect=lambda path, meta, **kwargs: written.append(meta)), \
+         unittest.mock.patch("google_takeout_metadata.processor.get_daemon"):
+        process_directory(tmp_path)
+    assert mock_find.call_count == 1
+    assert [meta.albums for meta in written] == [["Vacances"]] * 3
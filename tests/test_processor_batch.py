@@ -1,15 +1,19 @@
 """Tests pour la fonctionnalité de traitement par lots."""
 
 import json
+import logging
+import os
 import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 from PIL import Image
 
-from google_takeout_metadata.processor_batch import process_batch, process_directory_batch
+from google_takeout_metadata.processor_batch import _join_transactions, process_batch, process_directory_batch
 from google_takeout_metadata.sidecar import SidecarData
+from google_takeout_metadata.statistics import ProcessingStats
 
 
 def test_process_batch_empty_batch(tmp_path):
@@ -22,7 +26,7 @@ def test_process_batch_empty_batch(tmp_path):
 def test_process_batch_success(mock_subprocess_run, tmp_path):
     """Tester le traitement par lots réussi."""
     # Configuration
-    mock_subprocess_run.return_value = Mock(returncode=0, stdout="    1 image files updated")
+    mock_subprocess_run.return_value = Mock(returncode=0, stdout=b"    1 image files updated")
     
     media_path = tmp_path / "test.jpg"
     json_path = tmp_path / "test.jpg.json"
@@ -50,7 +54,7 @@ def test_process_batch_success(mock_subprocess_run, tmp_path):
 def test_process_batch_with_argfile_content(mock_subprocess_run, tmp_path):
     """Vérifier que le fichier d'arguments est créé avec le contenu correct."""
     # Setup
-    mock_subprocess_run.return_value = Mock(returncode=0, stdout="    2 image files updated")
+    mock_subprocess_run.return_value = Mock(returncode=0, stdout=b"    2 image files updated")
     
     media_path1 = tmp_path / "test1.jpg"
     media_path2 = tmp_path / "test2.jpg"
@@ -81,11 +85,106 @@ def test_process_batch_with_argfile_content(mock_subprocess_run, tmp_path):
     assert argfile_index + 1 < len(cmd)  # S'assurer qu'il y a un argument après "-@"
 
 
+@patch('google_takeout_metadata.processor_batch.subprocess.run')
+def test_process_batch_argfile_lines(mock_subprocess_run, tmp_path):
+    """Une ligne par argument, puis le chemin et -execute pour chaque fichier."""
+    contents = []
+    def run(cmd, **kwargs):
+        assert cmd[cmd.index("-@") + 1] == "-"
+        contents.append(kwargs["input"])
+        return Mock(returncode=0, stdout=None)
+    mock_subprocess_run.side_effect = run
+    
+    media_path = tmp_path / "Été.jpg"
+    batch = [(media_path, tmp_path / "Été.jpg.json", ["-XMP-dc:Title=Ligne 1\nLigne 2", "-XMP:Rating=5"])]
+    process_batch(batch, immediate_delete=False, efile_dir=tmp_path)
+    
+    assert contents[0].decode("utf-8").splitlines() == [
+        "#[CSTR]-XMP-dc:Title=Ligne 1\\nLigne 2", "-XMP:Rating=5", str(media_path), "-execute",
+    ]
+
+
+@patch('google_takeout_metadata.processor_batch.subprocess.run')
+def test_process_batch_common_args_once(mock_subprocess_run, tmp_path):
+    """Les options communes suivent -common_args sur la ligne de commande, pas le fichier d'arguments."""
+    mock_subprocess_run.return_value = Mock(returncode=0, stdout=None)
+    batch = [(tmp_path / "test.jpg", tmp_path / "test.jpg.json", ["-XMP:Rating=5"])]
+    process_batch(batch, immediate_delete=False, efile_dir=tmp_path, common_args=("-charset", "iptc=UTF8", "-n"))
+    cmd = mock_subprocess_run.call_args[0][0]
+    start = cmd.index("-common_args") + 1
+    assert cmd[start:start + 3] == ["-charset", "iptc=UTF8", "-n"]
+
+
+@patch('google_takeout_metadata.processor_batch.argfile_line', side_effect=lambda arg: arg)
+@patch('google_takeout_metadata.processor_batch.subprocess.run')
+def test_process_batch_identical_blocks_encoded_once(mock_subprocess_run, mock_argfile_line, tmp_path):
+    """Fichiers aux arguments identiques : une seule section, échappée une fois, pour tous."""
+    contents = []
+    def run(cmd, **kwargs):
+        assert cmd[cmd.index("-@") + 1] == "-"
+        contents.append(kwargs["input"])
+        return Mock(returncode=0, stdout=None)
+    mock_subprocess_run.side_effect = run
+    
+    args = ["-XMP-dc:Description=Rafale", "-XMP:Rating=5"]
+    batch = [(tmp_path / f"{i}.jpg", tmp_path / f"{i}.jpg.json", list(args)) for i in range(3)]
+    process_batch(batch, immediate_delete=False, efile_dir=tmp_path)
+    
+    assert mock_argfile_line.call_count == len(args)
+    assert contents[0].decode("utf-8").splitlines() == [
+        *args, *(str(tmp_path / f"{i}.jpg") for i in range(3)), "-execute"]
+
+
+def test_join_transactions_separates_strategy_groups():
+    """Chaque groupe de stratégie devient une section -execute portant le chemin du fichier."""
+    args = _join_transactions([["-if", "cond", "-XMP:Title=a"], ["-EXIF:DateTimeOriginal=b"]], Path("photo.jpg"))
+    assert args == ["-if", "cond", "-XMP:Title=a", Path("photo.jpg"), "-execute", "-EXIF:DateTimeOriginal=b"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Noms de fichiers non UTF-8 : POSIX uniquement")
+@patch('google_takeout_metadata.processor_batch.subprocess.run')
+def test_process_batch_non_utf8_path_between_sections(mock_subprocess_run, tmp_path):
+    """Un nom non UTF-8 (surrogate) est encodé en octets dans chaque section, pas seulement la dernière."""
+    contents = []
+    def run(cmd, **kwargs):
+        contents.append(kwargs["input"])
+        return Mock(returncode=0, stdout=None)
+    mock_subprocess_run.side_effect = run
+    
+    media_path = tmp_path / "x\udcff.jpg"
+    transactions = [["-fast2", "-if", "not $XMP-dc:Title", "-XMP-dc:Title=a"], ["-XMP:Rating=5"]]
+    batch = [(media_path, tmp_path / "x.jpg.json", _join_transactions(transactions, media_path))]
+    assert process_batch(batch, immediate_delete=True, efile_dir=tmp_path) == 1
+    
+    raw_path = os.fsencode(media_path)
+    assert contents[0].split(b"\n") == [
+        b"-fast2", b"-if", b"not $XMP-dc:Title", b"-XMP-dc:Title=a", raw_path, b"-execute",
+        b"-XMP:Rating=5", raw_path, b"-execute", b"",
+    ]
+
+
+@patch('google_takeout_metadata.processor_batch.subprocess.run')
+def test_process_batch_discards_stdout_without_debug(mock_subprocess_run, tmp_path, caplog):
+    """Vérifier que stdout n'est capturé qu'en mode debug (stderr toujours capturé)."""
+    mock_subprocess_run.return_value = Mock(returncode=0, stdout=None)
+    batch = [(tmp_path / "test.jpg", tmp_path / "test.jpg.json", ["-XMP:Rating=5"])]
+
+    caplog.set_level(logging.INFO, logger="google_takeout_metadata.processor_batch")
+    process_batch(batch, immediate_delete=False, efile_dir=tmp_path)
+    kwargs = mock_subprocess_run.call_args[1]
+    assert kwargs["stdout"] is subprocess.DEVNULL
+    assert kwargs["stderr"] is subprocess.PIPE
+
+    caplog.set_level(logging.DEBUG, logger="google_takeout_metadata.processor_batch")
+    process_batch(batch, immediate_delete=False, efile_dir=tmp_path)
+    assert mock_subprocess_run.call_args[1]["stdout"] is subprocess.PIPE
+
+
 @patch('google_takeout_metadata.processor_batch.subprocess.run')
 def test_process_batch_immediate_delete_sidecars(mock_subprocess_run, tmp_path):
     """Vérifier que les fichiers de sidecar sont supprimés immédiatement lorsqu'on le demande."""
     # Setup
-    mock_subprocess_run.return_value = Mock(returncode=0, stdout="    1 image files updated")
+    mock_subprocess_run.return_value = Mock(returncode=0, stdout=b"    1 image files updated")
     
     media_path = tmp_path / "test.jpg"
     json_path = tmp_path / "test.jpg.json"
@@ -124,7 +223,7 @@ def test_process_batch_exiftool_error(mock_subprocess_run, caplog, tmp_path):
     """Vérifier la gestion d'erreurs lorsque exiftool retourne une erreur."""
     # Setup
     mock_subprocess_run.side_effect = subprocess.CalledProcessError(
-        1, ["exiftool"], stderr="Some error"
+        1, ["exiftool"], stderr=b"Some error"
     )
     
     media_path = Path("test.jpg")
@@ -150,6 +249,55 @@ def test_process_directory_batch_no_sidecars(tmp_path, caplog):
     assert "Aucun fichier de métadonnées (.json) trouvé" in caplog.text
 
 
+def test_process_directory_batch_workers_run_batches_in_threads(tmp_path):
+    """Avec plusieurs workers, chaque lot de 100 fichiers part dans un thread dédié."""
+    for i in range(150):
+        (tmp_path / f"img{i}.jpg").write_bytes(b"")
+        (tmp_path / f"img{i}.jpg.json").write_text(json.dumps({"title": f"img{i}.jpg", "description": "x"}), encoding="utf-8")
+    
+    calls = []
+    def fake_process_batch(batch, immediate_delete, efile_dir, common_args=(), efile_suffix=""):
+        calls.append((len(batch), threading.current_thread().name))
+        # Chaque worker écrit ses propres logs -efile
+        efile_dir.mkdir(exist_ok=True)
+        (efile_dir / f"updated_files{efile_suffix}.txt").write_text(
+            "".join(f"{media_path}\n" for media_path, _, _ in batch), encoding="utf-8")
+        return len(batch)
+    
+    with patch('google_takeout_metadata.processor_batch.process_batch', side_effect=fake_process_batch), \
+         patch('google_takeout_metadata.processor_batch.fix_file_extension_mismatch', side_effect=lambda m, j: (m, j)):
+        process_directory_batch(tmp_path, workers=2)
+    
+    assert sorted(size for size, _ in calls) == [50, 100]
+    assert all(name.startswith("exiftool-batch") for _, name in calls)
+    # Logs des workers fusionnés dans le log commun, puis supprimés
+    logs = tmp_path / "logs"
+    assert sorted(path.name for path in logs.glob("*.txt")) == ["updated_files.txt"]
+    assert len((logs / "updated_files.txt").read_text(encoding="utf-8").splitlines()) == 150
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_directory_batch_failure_recorded_against_batch_files(tmp_path, workers):
+    """Un lot en échec est imputé à ses propres fichiers, pas au sidecar en cours de préparation."""
+    for i in range(101):
+        (tmp_path / f"img{i}.jpg").write_bytes(b"")
+        (tmp_path / f"img{i}.jpg.json").write_text(json.dumps({"title": f"img{i}.jpg", "description": "x"}), encoding="utf-8")
+    
+    def fake_process_batch(batch, immediate_delete, efile_dir, common_args=(), efile_suffix=""):
+        if len(batch) == 100:
+            raise subprocess.TimeoutExpired("exiftool", 1)
+        return len(batch)
+    
+    stats = ProcessingStats()
+    with patch('google_takeout_metadata.statistics.stats', stats), \
+         patch('google_takeout_metadata.processor_batch.process_batch', side_effect=fake_process_batch), \
+         patch('google_takeout_metadata.processor_batch.fix_file_extension_mismatch', side_effect=lambda m, j: (m, j)):
+        process_directory_batch(tmp_path, workers=workers)
+    
+    assert stats.total_failed == 100
+    assert stats.errors_by_type == {"exiftool_error": 100}
+
+
 @pytest.mark.integration
 def test_process_directory_batch_single_file(tmp_path):
     """Vérifier le traitement par lot d'un seul fichier."""
@@ -375,10 +523,10 @@ def test_process_directory_batch_invalid_sidecar(mock_parse_sidecar, tmp_path, c
     assert "Échec de la préparation de" in caplog.text
 
 
-@patch('google_takeout_metadata.processor_batch.build_exiftool_args')
+@patch('google_takeout_metadata.processor_batch.build_exiftool_transactions')
 def test_process_directory_batch_no_args_generated(mock_build_args, tmp_path):
     """Tester le traitement par lot quand aucun argument exiftool n'est généré."""
-    # Configuration - build_exiftool_args retourne une liste vide
+    # Configuration - build_exiftool_transactions retourne une liste vide
     mock_build_args.return_value = []
     
     # Créer l'image de test
@@ -392,9 +540,13 @@ def test_process_directory_batch_no_args_generated(mock_build_args, tmp_path):
     json_path.write_text(json.dumps(sidecar_data), encoding="utf-8")
     
     # Exécuter (ne devrait pas planter même sans arguments)
-    process_directory_batch(tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False)
+    stats = ProcessingStats()
+    with patch('google_takeout_metadata.statistics.stats', stats):
+        process_directory_batch(tmp_path, use_localTime=False, immediate_delete=False, organize_files=False, geocode=False)
     
-    # Aucune assertion spécifique nécessaire - juste s'assurer que ça ne plante pas
+    # Le sidecar est compté comme ignoré, via la méthode verrouillée des statistiques
+    assert stats.total_skipped == 1
+    assert stats.skipped_files == ["no_args.jpg.json: Aucune métadonnée à écrire"]
 
 
 def test_process_directory_batch_missing_media_file(tmp_path, caplog):
@@ -71,6 +71,22 @@ def test_parse_efile_logs_with_files(tmp_path):
     assert Path("failed1.jpg") in failed_condition_files
 
 
+def test_parse_efile_logs_collapses_multi_transaction_files(tmp_path):
+    """Un fichier écrit en plusieurs transactions n'est compté qu'une fois, selon la priorité."""
+    # a.jpg : transaction inconditionnelle écrite, transactions -if non satisfaites
+    (tmp_path / "updated_files.txt").write_text("a.jpg\nb.jpg\n")
+    (tmp_path / "failed_condition_files.txt").write_text("a.jpg\na.jpg\nc.jpg\nc.jpg\n")
+    (tmp_path / "unchanged_files.txt").write_text("b.jpg\nd.jpg\n")
+    (tmp_path / "error_files.txt").write_text("d.jpg\n")
+    
+    error_files, updated_files, unchanged_files, failed_condition_files = parse_efile_logs(tmp_path)
+    
+    assert error_files == [Path("d.jpg")]
+    assert updated_files == [Path("a.jpg"), Path("b.jpg")]
+    assert unchanged_files == []
+    assert failed_condition_files == [Path("c.jpg")]
+
+
 def test_build_resume_batch_errors_only():
     """Tester la construction d'un lot de reprise en mode erreurs uniquement."""
     error_files = [Path("error1.jpg"), Path("error2.jpg")]
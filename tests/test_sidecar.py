@@ -2,7 +2,7 @@ from pathlib import Path
 import json
 import pytest
 
-from google_takeout_metadata.sidecar import parse_sidecar
+from google_takeout_metadata.sidecar import parse_sidecar, SidecarData
 
 
 def test_parse_sidecar(tmp_path: Path) -> None:
@@ -351,3 +351,13 @@ def test_sidecar_with_albums_from_directory(tmp_path: Path) -> None:
     
     # Note: Nous ne pouvons pas tester process_sidecar_file sans exiftool
     # mais nous pouvons tester la logique de recherche d'albums séparément
+
+
+def test_sidecar_data_uses_slots() -> None:
+    """SidecarData utilise __slots__ mais reste modifiable (géocodage, albums)."""
+    meta = SidecarData(title="a.jpg")
+    assert not hasattr(meta, "__dict__")
+    meta.city = "Paris"
+    meta.albums.append("Vacances")
+    assert meta.city == "Paris"
+    assert meta.albums == ["Vacances"]
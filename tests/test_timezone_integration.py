@@ -114,6 +114,7 @@ def test_timezone_args_generation():
     
     # Vérifications des arguments vidéo
     assert any('-QuickTime:CreateDate=' in arg for arg in video_args), "CreateDate manquant"
+    assert '-QuickTime:CreateDate=2022:07:25 14:50:00' in video_args, "Format EXIF de la date UTC incorrect"
     assert any('-api' in arg for arg in video_args), "API QuickTime manquante"
     
     print("✅ Test génération arguments réussi!")